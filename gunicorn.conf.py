@@ -0,0 +1,19 @@
+# gunicorn -c gunicorn.conf.py
+#
+# SERVER_MODE=wsgi (default): sync Django/DRF on gthread workers.
+# SERVER_MODE=asgi: uvicorn workers running safemap.asgi, with the hazard
+# report reads served by the async views in map/views/hazard_report_async.py
+# and the /reports/events/ stream (not served under WSGI).
+# Worker count comes from WEB_CONCURRENCY and the port from PORT, as usual.
+import os
+
+if os.getenv('SERVER_MODE', 'wsgi') == 'asgi':
+    wsgi_app = 'safemap.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    os.environ.setdefault('HAZARD_ASYNC_READS', '1')
+else:
+    wsgi_app = 'safemap.wsgi:application'
+    worker_class = 'gthread'
+    threads = int(os.getenv('GUNICORN_THREADS', '8'))
+
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
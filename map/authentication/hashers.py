@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    pbkdf2_sha256 with the iteration count from HAZARD_PBKDF2_ITERATIONS,
+    never fewer than Django's own default.
+
+    Same algorithm name as Django's hasher, so existing hashes verify as
+    before. Only hashes with fewer iterations are rewritten on the next
+    successful login; a stronger stored hash is never downgraded.
+    """
+
+    @property
+    def iterations(self):
+        return max(
+            getattr(settings, 'HAZARD_PBKDF2_ITERATIONS', PBKDF2PasswordHasher.iterations),
+            PBKDF2PasswordHasher.iterations,
+        )
+
+    def must_update(self, encoded):
+        return self.decode(encoded)['iterations'] < self.iterations
@@ -0,0 +1,172 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from map.authentication.revocation import revoked_tokens
+
+# Copied from the user into each token, and from there into its access tokens
+PRINCIPAL_CLAIMS = ('role', 'is_staff', 'is_superuser')
+# jti of the refresh token an access token was issued from (its "session")
+SESSION_CLAIM = 'sid'
+
+
+def issue_tokens(user):
+    """RefreshToken for ``user`` carrying PRINCIPAL_CLAIMS (use .access_token for the access token)."""
+    refresh = RefreshToken.for_user(user)
+    for claim in PRINCIPAL_CLAIMS:
+        refresh[claim] = getattr(user, claim)
+    refresh[SESSION_CLAIM] = refresh[api_settings.JTI_CLAIM]
+    return refresh
+
+
+class PrincipalCache:
+    """
+    Current is_active/role/staff state of users whose account changed after
+    some of their tokens were issued.
+
+    Tokens are trusted as issued, so authenticating costs no query. When a
+    user is saved or deleted, its new state is published to the shared
+    Django cache for as long as older tokens can still be used. Every
+    process reads it through a small in-process LRU with a short TTL, so
+    most requests do not touch the cache backend either. ``None`` means
+    "unchanged, trust the claims".
+    """
+
+    def __init__(self, alias='default', maxsize=10000, ttl=30):
+        self.alias = alias
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _key(self, user_id):
+        return f'hazard_principal:{user_id}'
+
+    def _remember(self, user_id, state):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, state)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                return entry[1]
+        state = self.cache.get(self._key(user_id))
+        self._remember(user_id, state)
+        return state
+
+    def _publish(self, user_id, state):
+        lifetime = api_settings.REFRESH_TOKEN_LIFETIME + api_settings.ACCESS_TOKEN_LIFETIME
+        self.cache.set(self._key(user_id), state, timeout=int(lifetime.total_seconds()))
+        self._remember(user_id, state)
+
+    def publish(self, user):
+        state = {claim: getattr(user, claim) for claim in PRINCIPAL_CLAIMS}
+        state['is_active'] = user.is_active
+        self._publish(user.user_id, state)
+
+    def revoke(self, user_id):
+        self._publish(user_id, {'is_active': False})
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    alias=getattr(settings, 'HAZARD_PRINCIPAL_CACHE_ALIAS', 'default'),
+    maxsize=getattr(settings, 'HAZARD_PRINCIPAL_CACHE_SIZE', 10000),
+    ttl=getattr(settings, 'HAZARD_PRINCIPAL_CACHE_TTL', 30),
+)
+
+
+class TokenPrincipal(TokenUser):
+    """
+    request.user for JWT requests.
+
+    user_id, role and the staff flags come from the signed claims, or from
+    principal_cache when the account changed since the token was issued.
+    Any other attribute (email, name, ...) loads the User row once, on
+    first access.
+    """
+
+    def __init__(self, token, state=None):
+        super().__init__(token)
+        self.state = state or {}
+
+    def __str__(self):
+        return f"TokenPrincipal {self.user_id}"
+
+    @cached_property
+    def user_id(self):
+        return uuid.UUID(str(self.token[api_settings.USER_ID_CLAIM]))
+
+    @cached_property
+    def role(self):
+        return self.state.get('role', self.token.get('role'))
+
+    @cached_property
+    def is_staff(self):
+        return self.state.get('is_staff', self.token.get('is_staff', False))
+
+    @cached_property
+    def is_superuser(self):
+        return self.state.get('is_superuser', self.token.get('is_superuser', False))
+
+    @cached_property
+    def user(self):
+        from map.models.user import User
+
+        return User.objects.get(user_id=self.user_id)
+
+    def __getattr__(self, attr):
+        if attr.startswith('_') or attr in ('token', 'state'):
+            raise AttributeError(attr)
+        return getattr(self.user, attr)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    SimpleJWT authentication without the per-request user lookup: the
+    principal is built from the token (see TokenPrincipal) and only
+    checked against principal_cache for accounts deactivated or changed
+    since the token was issued. Tokens whose session was logged out are
+    rejected through revoked_tokens instead of a blacklist query.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        session = token.get(SESSION_CLAIM, token.get(api_settings.JTI_CLAIM))
+        if revoked_tokens.is_revoked(session):
+            raise InvalidToken(_("Token is blacklisted"))
+        return token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = uuid.UUID(str(validated_token[api_settings.USER_ID_CLAIM]))
+        except (KeyError, ValueError):
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        state = principal_cache.get(user_id)
+        if state is not None and not state.get('is_active', True):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return TokenPrincipal(validated_token, state)
@@ -0,0 +1,74 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the hashing pool is full or a hash misses the timeout."""
+
+
+class PasswordHashingPool:
+    """
+    Bounded thread pool for password hashing.
+
+    PBKDF2 (hashlib) releases the GIL, so hashing runs in parallel with the
+    request threads instead of pinning the worker. At most ``workers`` hashes
+    run at once and ``queue_size`` more may wait; beyond that submit()
+    raises PasswordHashingBusy right away, so a login storm turns into fast
+    503s rather than a CPU-bound backlog that starves the hazard reads.
+    """
+
+    def __init__(self, workers=2, queue_size=16, timeout=10):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        # Created lazily so a pool started before gunicorn forks is not shared
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='password-hash')
+        return self._executor
+
+    def submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashingBusy()
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn, *args):
+        try:
+            return self.submit(fn, *args).result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # The hash keeps its slot until it finishes, so the pool stays bounded
+            raise PasswordHashingBusy()
+
+
+def verify_password(password, encoded):
+    """
+    Check ``password`` against ``encoded``. Returns (valid, new_encoded):
+    new_encoded is a rehash with the preferred hasher when the stored one
+    is outdated, else None. Meant to run inside the pool.
+    """
+    upgraded = []
+    valid = check_password(password, encoded, setter=lambda raw: upgraded.append(make_password(raw)))
+    return valid, (upgraded[0] if upgraded else None)
+
+
+password_hashing = PasswordHashingPool(
+    workers=getattr(settings, 'HAZARD_PASSWORD_WORKERS', 2),
+    queue_size=getattr(settings, 'HAZARD_PASSWORD_QUEUE', 16),
+    timeout=getattr(settings, 'HAZARD_PASSWORD_TIMEOUT', 10),
+)
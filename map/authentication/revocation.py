@@ -0,0 +1,144 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings (double hashing on one blake2b
+    digest). No false negatives; false positives at about ``fp_rate`` while
+    it holds at most ``capacity`` items.
+    """
+
+    def __init__(self, capacity, fp_rate=0.001):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.size = max(64, int(math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class RevokedTokenFilter:
+    """
+    Per-worker set of revoked refresh-token jtis (SimpleJWT's blacklist).
+
+    Checks go to a Bloom filter first, so the usual never-revoked token is
+    answered from memory; only filter hits consult the exact ``{jti: exp}``
+    map. The worker loads the blacklist on its first check. After that it
+    pulls rows blacklisted since the newest one it saw, minus an
+    ``overlap`` margin, at most every HAZARD_REVOCATION_REFRESH seconds.
+    Ids are not used as the watermark: a row can commit after one with a
+    higher id. Every ``full_reload_interval`` seconds the whole blacklist
+    is read again, for rows that took even longer to commit. Entries past
+    their ``exp`` are pruned on each load and the Bloom filter is rebuilt
+    from what is left.
+    """
+
+    def __init__(self, capacity=100000, fp_rate=0.001, refresh_interval=5, overlap=60, full_reload_interval=300):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.refresh_interval = refresh_interval
+        self.overlap = overlap
+        self.full_reload_interval = full_reload_interval
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._exact = {}
+        self._bloom = BloomFilter(self.capacity, self.fp_rate)
+        self._last_seen = None
+        self._next_refresh = 0.0
+        self._next_full_reload = 0.0
+
+    def _rebuild(self):
+        capacity = self.capacity
+        while capacity < len(self._exact):
+            capacity *= 2
+        bloom = BloomFilter(capacity, self.fp_rate)
+        for jti in self._exact:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    def _add(self, jti, exp):
+        self._exact[jti] = exp
+        if len(self._exact) > self._bloom.capacity:
+            self._rebuild()
+        else:
+            self._bloom.add(jti)
+
+    def _load(self, full=False):
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+        rows = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+        if not full and self._last_seen is not None:
+            # Re-reading the overlap is harmless: adding a jti twice is a no-op
+            rows = rows.filter(blacklisted_at__gte=self._last_seen - timedelta(seconds=self.overlap))
+        for jti, expires_at, blacklisted_at in rows.values_list('token__jti', 'token__expires_at', 'blacklisted_at'):
+            if jti not in self._exact:
+                self._add(jti, expires_at.timestamp())
+            if self._last_seen is None or blacklisted_at > self._last_seen:
+                self._last_seen = blacklisted_at
+
+        now = time.time()
+        expired = [jti for jti, exp in self._exact.items() if exp <= now]
+        if expired:
+            for jti in expired:
+                del self._exact[jti]
+            self._rebuild()
+
+    def _refresh(self):
+        if time.monotonic() < self._next_refresh:
+            return
+        with self._lock:
+            if time.monotonic() < self._next_refresh:
+                return
+            full = time.monotonic() >= self._next_full_reload
+            self._load(full=full)
+            self._next_refresh = time.monotonic() + self.refresh_interval
+            if full:
+                self._next_full_reload = time.monotonic() + self.full_reload_interval
+
+    def is_revoked(self, jti):
+        if not jti:
+            return False
+        self._refresh()
+        if jti not in self._bloom:
+            return False
+        exp = self._exact.get(jti)
+        return exp is not None and exp > time.time()
+
+    def revoke(self, jti, exp):
+        """Record a logout made by this worker right away (others see it on their next load)."""
+        with self._lock:
+            self._add(jti, float(exp))
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+
+revoked_tokens = RevokedTokenFilter(
+    capacity=getattr(settings, 'HAZARD_REVOCATION_CAPACITY', 100000),
+    fp_rate=getattr(settings, 'HAZARD_REVOCATION_FP_RATE', 0.001),
+    refresh_interval=getattr(settings, 'HAZARD_REVOCATION_REFRESH', 5),
+    overlap=getattr(settings, 'HAZARD_REVOCATION_OVERLAP', 60),
+    full_reload_interval=getattr(settings, 'HAZARD_REVOCATION_FULL_RELOAD', 300),
+)
@@ -0,0 +1,113 @@
+import itertools
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+REPLICA_PREFIX = 'replica_'
+
+# 0 on the primary, or when the replica has replayed everything it received
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith(REPLICA_PREFIX)]
+
+
+class ReplicaSet:
+    """
+    Health-checked round robin over the replica_* database aliases.
+
+    Each replica's lag is measured at most every ``check_interval`` seconds
+    per process; a replica that is unreachable or more than ``max_lag``
+    seconds behind is skipped until its next check. choose() returns None
+    when no replica is usable, which callers treat as "read the primary".
+    """
+
+    def __init__(self, max_lag=5, check_interval=10):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._health = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def lag(self, alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            return float(cursor.fetchone()[0])
+
+    def _check(self, alias):
+        try:
+            lag = self.lag(alias)
+        except DatabaseError:
+            connections[alias].close()
+            lag = None
+        return {'lag': lag, 'healthy': lag is not None and lag <= self.max_lag}
+
+    def health(self, alias):
+        entry = self._health.get(alias)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        # One thread re-checks; the others keep the last result rather than
+        # wait on a replica that may be timing out
+        if not self._lock.acquire(blocking=entry is None):
+            return entry[1]
+        try:
+            entry = self._health.get(alias)
+            if entry is None or entry[0] <= time.monotonic():
+                entry = (time.monotonic() + self.check_interval, self._check(alias))
+                self._health[alias] = entry
+            return entry[1]
+        finally:
+            self._lock.release()
+
+    def choose(self):
+        aliases = replica_aliases()
+        if not aliases:
+            return None
+        start = next(self._counter)
+        for offset in range(len(aliases)):
+            alias = aliases[(start + offset) % len(aliases)]
+            if self.health(alias)['healthy']:
+                return alias
+        return None
+
+    def status(self):
+        return {alias: self.health(alias) for alias in replica_aliases()}
+
+    def reset(self):
+        with self._lock:
+            self._health.clear()
+
+
+replicas = ReplicaSet(
+    max_lag=getattr(settings, 'HAZARD_REPLICA_MAX_LAG', 5),
+    check_interval=getattr(settings, 'HAZARD_REPLICA_CHECK_INTERVAL', 10),
+)
+
+
+class PrimaryReplicaRouter:
+    """
+    Everything reads and writes the primary unless a queryset asks for a
+    replica explicitly with .using(); the report read endpoints do that
+    through ReplicaReadMixin. Replicas hold the same data, so relations
+    across aliases are allowed, and they are never migrated.
+    """
+
+    def db_for_read(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
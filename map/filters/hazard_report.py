@@ -0,0 +1,77 @@
+# map/filters/hazard_report.py
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.settings import api_settings
+
+from map.utils.geo import parse_bbox
+
+
+class BoundingBoxFilter(BaseFilterBackend):
+    """
+    ?bbox=minLon,minLat,maxLon,maxLat
+
+    Runs as a range scan on the (latitude, longitude) index.
+    """
+    bbox_param = 'bbox'
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get(self.bbox_param)
+        if not value:
+            return queryset
+
+        try:
+            bbox = parse_bbox(value)
+        except ValueError as exc:
+            raise ValidationError({self.bbox_param: [str(exc)]})
+        return filter_by_bbox(queryset, bbox)
+
+
+def filter_by_bbox(queryset, bbox):
+    """Restrict to reports inside a parsed (minLon, minLat, maxLon, maxLat) box."""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    queryset = queryset.filter(latitude__gte=min_lat, latitude__lte=max_lat)
+    if min_lon <= max_lon:
+        return queryset.filter(longitude__gte=min_lon, longitude__lte=max_lon)
+    # Box crosses the antimeridian
+    return queryset.filter(Q(longitude__gte=min_lon) | Q(longitude__lte=max_lon))
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    ?search=<terms>
+
+    Matches every term as a prefix against the trigger-maintained
+    search_vector (name, street_name, description, type, status, severity)
+    through its GIN index, or the whole text against street_name by trigram
+    word similarity, so partial or misspelt street names still hit.
+    Annotates ``search_rank`` for relevance ordering (cast to double precision
+    so keyset cursors compare it exactly).
+    """
+    search_param = api_settings.SEARCH_PARAM
+    max_terms = 8
+
+    def get_search_terms(self, request):
+        value = request.query_params.get(self.search_param, '')
+        return re.findall(r'\w+', value.lower())[:self.max_terms]
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        text = ' '.join(terms)
+        # Terms are \w+ only, so they are safe to place in a raw tsquery
+        query = SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw', config='simple')
+        return (
+            queryset
+            .filter(Q(search_vector=query) | Q(street_name__trigram_word_similar=text))
+            .annotate(search_rank=Cast(
+                SearchRank(F('search_vector'), query) + TrigramWordSimilarity(text, 'street_name'),
+                FloatField(),
+            ))
+        )
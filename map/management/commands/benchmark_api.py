@@ -0,0 +1,278 @@
+import http.client
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from contextlib import ExitStack
+from urllib.parse import urlsplit
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from map.authentication.jwt import issue_tokens
+from map.management.commands.benchmark_concurrency import start_server
+from map.management.commands.seed_hazards import CITIES, DESCRIPTIONS, STREETS
+from map.models.hazard_report import HazardReport
+from map.models.user import User
+from map.utils.latency import percentile
+from map.utils.response_cache import report_responses
+
+EMAIL = 'benchmark-api@example.com'
+PASSWORD = 'benchmark-api-password'
+
+# name -> (method, path, needs a token); paths are relative to /api/v1
+SCENARIOS = {
+    'list': ('GET', '/reports/?page_size={page_size}', False),
+    'pending': ('GET', '/reports/pending/?page_size={page_size}', False),
+    'approve': ('GET', '/reports/approve/?page_size={page_size}', False),
+    'search': ('GET', '/reports/?search={search}&page_size={page_size}', False),
+    'login': ('POST', '/login', False),
+    'create': ('POST', '/reports/', True),
+}
+# Each login verifies a PBKDF2 hash; a handful is enough for percentiles
+SLOW_SCENARIOS = {'login'}
+METRICS = ('p50_ms', 'p90_ms', 'p99_ms', 'queries', 'bytes')
+
+
+class ClientTarget:
+    """Requests through django.test.Client, counting queries on every database."""
+
+    def __init__(self, headers):
+        # A failing view counts as a 500, as it would over HTTP
+        self.client = Client(headers=headers, raise_request_exception=False)
+        self.prefix = '/api/v1'
+
+    def request(self, method, path, body, headers):
+        path = self.prefix + path
+        with ExitStack() as stack:
+            captured = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+            started = time.perf_counter()
+            if method == 'GET':
+                response = self.client.get(path, headers=headers)
+            else:
+                response = self.client.post(path, body, content_type='application/json', headers=headers)
+            elapsed = time.perf_counter() - started
+        # The test client does not fire request_finished's connection cleanup
+        close_old_connections()
+        return response.status_code, elapsed, sum(len(c.captured_queries) for c in captured), len(response.content)
+
+    def close(self):
+        pass
+
+
+class HTTPTarget:
+    """Requests over one keep-alive connection to a running server."""
+
+    def __init__(self, base_url, headers):
+        parts = urlsplit(base_url)
+        self.prefix = parts.path.rstrip('/')
+        self.connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+        self.headers = headers
+
+    def request(self, method, path, body, headers):
+        started = time.perf_counter()
+        self.connection.request(method, self.prefix + path, body=body, headers={
+            **self.headers, **headers, **({'Content-Type': 'application/json'} if body else {}),
+        })
+        response = self.connection.getresponse()
+        content = response.read()
+        elapsed = time.perf_counter() - started
+        if response.getheader('Connection', '').lower() == 'close':
+            self.connection.close()
+        return response.status, elapsed, None, len(content)
+
+    def close(self):
+        self.connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the API benchmark scenarios (list, pending, approve, search, login, create) "
+        "through the Django test client and/or a real HTTP server, and write latency "
+        "percentiles, queries per request and payload bytes to a JSON file. "
+        "Seed data first with seed_hazards; compare runs with --compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', action='append', choices=tuple(SCENARIOS), help='Default: all')
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per scenario')
+        parser.add_argument('--login-requests', type=int, default=10)
+        parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests per scenario')
+        parser.add_argument('--page-size', type=int, default=50)
+        parser.add_argument('--search', default='flood')
+        parser.add_argument('--accept-encoding', default='identity', help='Sent with every request')
+        parser.add_argument('--client', action='store_true', help='Run through the Django test client')
+        parser.add_argument('--url', help='Base URL of a running server, e.g. http://127.0.0.1:8000/api/v1')
+        parser.add_argument('--serve', action='append', choices=('wsgi', 'asgi'), help='Start gunicorn in this mode')
+        parser.add_argument('--workers', type=int, default=2, help='gunicorn workers with --serve')
+        parser.add_argument('--port', type=int, default=8766)
+        parser.add_argument('--seed', type=int, default=0, help='Random seed for created reports')
+        parser.add_argument('--output', help='Write results to this JSON file')
+        parser.add_argument('--compare', help='Print the change against an earlier --output file')
+
+    # ------------------------
+    # Scenarios
+    # ------------------------
+    def _body(self, name, rng, user):
+        if name == 'login':
+            return json.dumps({'email': EMAIL, 'password': PASSWORD})
+        if name == 'create':
+            lat, lon, _, spread = rng.choice(CITIES)
+            street = rng.choice(STREETS)
+            return json.dumps({
+                'name': f'Benchmark report on {street}',
+                'street_name': street,
+                'latitude': round(rng.gauss(lat, spread), 6),
+                'longitude': round(rng.gauss(lon, spread), 6),
+                'description': DESCRIPTIONS['flood'].format(n=rng.randint(2, 80)),
+                'type': 'flood',
+                'severity': rng.choice(('low', 'medium', 'high')),
+                'user_id': str(user.user_id),
+            })
+        return None
+
+    def _run_scenario(self, target, name, options, user, token, rng):
+        method, path, authenticated = SCENARIOS[name]
+        path = path.format(page_size=options['page_size'], search=options['search'])
+        headers = {'Authorization': f'Bearer {token}'} if authenticated else {}
+        count = options['login_requests'] if name in SLOW_SCENARIOS else options['requests']
+
+        latencies, queries, sizes, statuses = [], [], [], {}
+        for i in range(max(0, options['warmup']) + max(1, count)):
+            body = self._body(name, rng, user)
+            status_code, elapsed, query_count, size = target.request(method, path, body, headers)
+            if i < options['warmup']:
+                continue
+            latencies.append(elapsed * 1000)
+            sizes.append(size)
+            if query_count is not None:
+                queries.append(query_count)
+            statuses[str(status_code)] = statuses.get(str(status_code), 0) + 1
+
+        return {
+            'method': method,
+            'path': path,
+            'requests': len(latencies),
+            'statuses': statuses,
+            'p50_ms': round(percentile(latencies, 0.5), 3),
+            'p90_ms': round(percentile(latencies, 0.90), 3),
+            'p99_ms': round(percentile(latencies, 0.99), 3),
+            'mean_ms': round(statistics.fmean(latencies), 3),
+            'max_ms': round(max(latencies), 3),
+            'queries': round(statistics.fmean(queries), 2) if queries else None,
+            'bytes': round(statistics.fmean(sizes)),
+        }
+
+    def _run_target(self, label, target, scenarios, options, user, token):
+        rng = random.Random(options['seed'])
+        results = {}
+        try:
+            for name in scenarios:
+                results[name] = result = self._run_scenario(target, name, options, user, token, rng)
+                queries = '-' if result['queries'] is None else f"{result['queries']:.1f}"
+                self.stdout.write(
+                    f"{label:<10} {name:<8} p50 {result['p50_ms']:>8.2f} ms  p90 {result['p90_ms']:>8.2f} ms  "
+                    f"p99 {result['p99_ms']:>8.2f} ms  queries {queries:>5}  bytes {result['bytes']:>8}  "
+                    f"statuses {result['statuses']}"
+                )
+        finally:
+            target.close()
+        return results
+
+    # ------------------------
+    # Output
+    # ------------------------
+    def _metadata(self, options, scenarios):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                capture_output=True, text=True, timeout=10,
+            ).stdout.strip() or None
+        except OSError:
+            commit = None
+        return {
+            'started_at': timezone.now().isoformat(),
+            'git_commit': commit,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connections['default'].vendor,
+            'reports': HazardReport.objects.count(),
+            'scenarios': list(scenarios),
+            'options': {key: options[key] for key in (
+                'requests', 'login_requests', 'warmup', 'page_size', 'search', 'accept_encoding', 'workers',
+            )},
+        }
+
+    def _compare(self, path, runs):
+        try:
+            with open(path, encoding='utf-8') as handle:
+                previous = json.load(handle)['runs']
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+
+        self.stdout.write(f"\nChange against {path}:")
+        for label, results in runs.items():
+            for name, result in results.items():
+                before = previous.get(label, {}).get(name)
+                if before is None:
+                    continue
+                changes = []
+                for metric in METRICS:
+                    old, new = before.get(metric), result.get(metric)
+                    if old is None or new is None:
+                        continue
+                    delta = f"{(new - old) / old * 100:+.1f}%" if old else f"{new - old:+g}"
+                    changes.append(f"{metric} {old:g} -> {new:g} ({delta})")
+                self.stdout.write(f"{label:<10} {name:<8} " + '  '.join(changes))
+
+    # ------------------------
+    # Entry point
+    # ------------------------
+    def handle(self, *args, **options):
+        scenarios = options['scenario'] or tuple(SCENARIOS)
+        use_client = options['client'] or not (options['url'] or options['serve'])
+        if not HazardReport.objects.exists():
+            self.stderr.write("No hazard reports: run seed_hazards first for meaningful numbers")
+
+        user, _ = User.objects.get_or_create(email=EMAIL, defaults={'name': 'Benchmark', 'role': 'User'})
+        user.set_password(PASSWORD)
+        user.save(update_fields=['password'])
+        token = str(issue_tokens(user).access_token)
+        headers = {'Accept': 'application/json', 'Accept-Encoding': options['accept_encoding']}
+
+        output = {'meta': self._metadata(options, scenarios), 'runs': {}}
+        runs = output['runs']
+        try:
+            if use_client:
+                runs['client'] = self._run_target('client', ClientTarget(headers), scenarios, options, user, token)
+            if options['url']:
+                target = HTTPTarget(options['url'], headers)
+                runs['http'] = self._run_target('http', target, scenarios, options, user, token)
+            for mode in options['serve'] or ():
+                server, url = start_server(mode, options['port'], options['workers'], '/api/v1/reports/?page_size=1')
+                try:
+                    target = HTTPTarget(url.split('/reports/')[0], headers)
+                    runs[f'http:{mode}'] = self._run_target(f'http:{mode}', target, scenarios, options, user, token)
+                finally:
+                    server.terminate()
+                    server.wait(timeout=30)
+        finally:
+            # Reports created by the create scenario go with the user
+            deleted, _ = HazardReport.objects.filter(user=user).delete()
+            user.delete()
+            if deleted:
+                report_responses.bump_version()
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                json.dump(output, handle, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        if options['compare']:
+            self._compare(options['compare'], runs)
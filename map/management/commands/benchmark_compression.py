@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from map.models.hazard_report import HazardReport
+from map.utils.compression import available_encodings, compress, compress_stream
+
+PATHS = (
+    '/api/v1/reports/?page_size=500',
+    '/api/v1/reports/approve/?page_size=500',
+    '/api/v1/reports/?page_size=500&format=pins',
+    '/api/v1/reports/export/?format=ndjson',
+    '/api/v1/reports/export/?format=geojson',
+    '/api/v1/reports/export/?format=csv',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure response sizes and compression cost of the report endpoints "
+        "against the current database (seed it first for realistic numbers)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', dest='paths', help='Endpoint to measure (repeatable)')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per encoding; the best time is reported')
+
+    def _identity(self, client, path):
+        response = client.get(path, HTTP_ACCEPT_ENCODING='identity')
+        if response.status_code != 200:
+            raise CommandError(f"{path} returned {response.status_code}")
+        if response.streaming:
+            return [chunk if isinstance(chunk, bytes) else chunk.encode() for chunk in response.streaming_content], True
+        return [response.content], False
+
+    def handle(self, *args, **options):
+        client = Client()
+        repeat = max(1, options['repeat'])
+        encodings = available_encodings()
+        self.stdout.write(f"{HazardReport.objects.count()} reports in the database; encodings: {', '.join(encodings)}")
+
+        header = f"{'endpoint':<46}{'identity':>11}"
+        for encoding in encodings:
+            header += f"{encoding:>11}{'ms':>8}"
+        self.stdout.write(header)
+
+        for path in options['paths'] or PATHS:
+            chunks, streaming = self._identity(client, path)
+            body = b''.join(chunks)
+            line = f"{path:<46}{len(body):>11}"
+            for encoding in encodings:
+                best = None
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    if streaming:
+                        encoded = b''.join(compress_stream(chunks, encoding))
+                    else:
+                        encoded = compress(body, encoding)
+                    elapsed = (time.perf_counter() - started) * 1000
+                    best = elapsed if best is None else min(best, elapsed)
+                line += f"{len(encoded):>11}{best:>8.1f}"
+            self.stdout.write(line + ('  (streamed)' if streaming else ''))
+
+        # Cached feeds are compressed once: a warm hit should cost almost nothing
+        path = '/api/v1/reports/approve/?page_size=500'
+        client.get(path, HTTP_ACCEPT_ENCODING=encodings[0])
+        started = time.perf_counter()
+        for _ in range(repeat):
+            response = client.get(path, HTTP_ACCEPT_ENCODING=encodings[0])
+        elapsed = (time.perf_counter() - started) * 1000 / repeat
+        self.stdout.write(
+            f"cached {path} with {response.get('Content-Encoding', 'identity')}: "
+            f"{len(response.content)} bytes, {elapsed:.2f} ms per request"
+        )
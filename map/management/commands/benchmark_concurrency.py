@@ -0,0 +1,161 @@
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from map.utils.latency import percentile
+
+
+async def _read_response(reader):
+    """Read one HTTP/1.1 response; returns (status, body length)."""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ', 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+    if 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+        return status, len(body), headers
+    if headers.get('transfer-encoding') == 'chunked':
+        size = 0
+        while True:
+            chunk_size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            await reader.readexactly(chunk_size + 2)
+            size += chunk_size
+            if chunk_size == 0:
+                return status, size, headers
+    return status, len(await reader.read()), headers
+
+
+async def _connection(host, port, request, deadline, latencies, errors):
+    reader = writer = None
+    while time.monotonic() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status, _, headers = await _read_response(reader)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status != 200:
+                errors[status] = errors.get(status, 0) + 1
+            if headers.get('connection', '').lower() == 'close':
+                writer.close()
+                writer = None
+        except (OSError, asyncio.IncompleteReadError, ValueError) as exc:
+            errors[type(exc).__name__] = errors.get(type(exc).__name__, 0) + 1
+            if writer is not None:
+                writer.close()
+            writer = None
+            await asyncio.sleep(0.05)
+    if writer is not None:
+        writer.close()
+
+
+async def run_load(url, connections, duration):
+    parts = urlsplit(url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    request = (
+        f'GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n'
+        f'Accept-Encoding: identity\r\nConnection: keep-alive\r\n\r\n'
+    ).encode('ascii')
+    latencies, errors = [], {}
+    deadline = time.monotonic() + duration
+    started = time.monotonic()
+    await asyncio.gather(*(
+        _connection(parts.hostname, parts.port or 80, request, deadline, latencies, errors)
+        for _ in range(connections)
+    ))
+    return latencies, errors, time.monotonic() - started
+
+
+def start_server(mode, port, workers, path):
+    """
+    Start gunicorn (gunicorn.conf.py) in SERVER_MODE ``mode`` on 127.0.0.1 and
+    wait until ``path`` answers; returns (process, url of path).
+    """
+    env = dict(os.environ, SERVER_MODE=mode, WEB_CONCURRENCY=str(workers))
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', str(settings.BASE_DIR / 'gunicorn.conf.py'),
+         '--bind', f"127.0.0.1:{port}", '--log-level', 'warning'],
+        cwd=settings.BASE_DIR, env=env,
+    )
+    url = f"http://127.0.0.1:{port}{path}"
+    for _ in range(100):
+        time.sleep(0.2)
+        if server.poll() is not None:
+            raise CommandError(f"gunicorn ({mode}) exited with {server.returncode}")
+        try:
+            latencies, _, _ = asyncio.run(run_load(url, 1, 0.01))
+        except OSError:
+            continue
+        if latencies:
+            return server, url
+    server.terminate()
+    raise CommandError(f"gunicorn ({mode}) did not start")
+
+
+class Command(BaseCommand):
+    help = (
+        "Hold N concurrent keep-alive connections against a report endpoint and report "
+        "p50/p99 latency and throughput. With --serve, starts gunicorn (gunicorn.conf.py) "
+        "in that SERVER_MODE first, so the sync and async deployments can be compared."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/v1/reports/approve/?page_size=50')
+        parser.add_argument('--url', help='Benchmark an already running server instead (full URL)')
+        parser.add_argument('--serve', action='append', choices=('wsgi', 'asgi'), help='Mode(s) to start and compare')
+        parser.add_argument('--connections', type=int, default=1000)
+        parser.add_argument('--duration', type=float, default=15, help='Seconds per run')
+        parser.add_argument('--workers', type=int, default=2, help='gunicorn workers per mode')
+        parser.add_argument('--port', type=int, default=8765)
+
+    def _raise_fd_limit(self, connections):
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        wanted = connections * 2 + 256
+        if soft < wanted:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard), hard))
+
+    def _start(self, mode, options):
+        return start_server(mode, options['port'], options['workers'], options['path'])
+
+    def _report(self, label, latencies, errors, elapsed):
+        if not latencies:
+            self.stdout.write(f"{label}: no responses; errors {errors}")
+            return
+        self.stdout.write(
+            f"{label:<6} {len(latencies):>8} req  {len(latencies) / elapsed:>8.0f} req/s  "
+            f"p50 {percentile(latencies, 0.5):>8.1f} ms  p99 {percentile(latencies, 0.99):>8.1f} ms  "
+            f"errors {errors or 0}"
+        )
+
+    def handle(self, *args, **options):
+        connections = max(1, options['connections'])
+        self._raise_fd_limit(connections)
+        self.stdout.write(f"{connections} connections, {options['duration']:.0f} s per run")
+
+        if options['url']:
+            self._report('url', *asyncio.run(run_load(options['url'], connections, options['duration'])))
+            return
+
+        for mode in options['serve'] or ('wsgi', 'asgi'):
+            server, url = self._start(mode, options)
+            try:
+                # Warm up caches and connection pools before measuring
+                asyncio.run(run_load(url, min(connections, 50), 2))
+                self._report(mode, *asyncio.run(run_load(url, connections, options['duration'])))
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
@@ -0,0 +1,61 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.test import Client
+
+from map.utils.db_pool import pool_stats
+from map.utils.latency import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Time API requests end to end, including getting a database connection. "
+        "Run it with DB_POOL=1 and DB_POOL=0 to compare pooled and unpooled connections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/v1/reports/?page_size=1', help='Endpoint to request')
+        parser.add_argument('--requests', type=int, default=500, help='Total requests')
+        parser.add_argument('--concurrency', type=int, default=8, help='Threads issuing requests')
+
+    def _request(self, path):
+        started = time.perf_counter()
+        response = Client().get(path)
+        # The test client does not run close_old_connections on request_finished;
+        # do it here so each request gives its connection back like in production
+        close_old_connections()
+        elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code != 200:
+            raise CommandError(f"{path} returned {response.status_code}")
+        return elapsed
+
+    def _worker(self, path, count):
+        try:
+            return [self._request(path) for _ in range(count)]
+        finally:
+            connections.close_all()
+
+    def handle(self, *args, **options):
+        path = options['path']
+        total = max(1, options['requests'])
+        concurrency = max(1, options['concurrency'])
+        pooled = bool(settings.DATABASES['default'].get('OPTIONS', {}).get('pool'))
+        mode = 'pooled' if pooled else f"CONN_MAX_AGE={settings.DATABASES['default'].get('CONN_MAX_AGE', 0)}"
+        self.stdout.write(f"{total} x GET {path}, {concurrency} threads, {mode}")
+
+        shares = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            latencies = [ms for chunk in executor.map(lambda n: self._worker(path, n), shares) for ms in chunk]
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"p50 {percentile(latencies, 0.5):.2f} ms  p99 {percentile(latencies, 0.99):.2f} ms  "
+            f"{len(latencies) / elapsed:.0f} req/s"
+        )
+        stats = pool_stats()
+        if stats is not None:
+            self.stdout.write(' '.join(f"{key}={value}" for key, value in stats.items()))
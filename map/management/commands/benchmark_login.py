@@ -0,0 +1,124 @@
+import http.client
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connections
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from map.authentication.passwords import password_hashing
+from map.management.commands.benchmark_concurrency import start_server
+from map.models.user import User
+from map.utils.latency import percentile
+
+EMAIL = 'benchmark-login@example.com'
+PASSWORD = 'benchmark-login-password'
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent POST /api/v1/login requests and report throughput, "
+        "latency percentiles and how many were shed with 503 by the hashing pool, "
+        "plus the latency of a report read issued back to back during the storm. "
+        "With --serve the storm runs against one gunicorn worker (gunicorn.conf.py), "
+        "so logins and reads share its GUNICORN_THREADS threads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Total login requests')
+        parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight at once')
+        parser.add_argument('--read-path', default='/api/v1/reports/approve/?page_size=50')
+        parser.add_argument('--baseline-reads', type=int, default=20, help='Reads measured before the storm')
+        parser.add_argument('--url', help='Base URL of a running server, e.g. http://127.0.0.1:8000')
+        parser.add_argument('--serve', action='store_true', help='Start one gunicorn wsgi worker')
+        parser.add_argument('--port', type=int, default=8767)
+
+    def _request(self, method, path, body=None):
+        started = time.perf_counter()
+        if self.base_url is None:
+            client = Client()
+            try:
+                if method == 'GET':
+                    response = client.get(path)
+                else:
+                    response = client.post(path, body, content_type='application/json')
+                return response.status_code, (time.perf_counter() - started) * 1000
+            finally:
+                connections.close_all()
+
+        parts = urlsplit(self.base_url)
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=120)
+        try:
+            connection.request(method, path, body=body, headers={'Content-Type': 'application/json'} if body else {})
+            response = connection.getresponse()
+            response.read()
+            return response.status, (time.perf_counter() - started) * 1000
+        finally:
+            connection.close()
+
+    def _login(self, _):
+        return self._request('POST', '/api/v1/login', json.dumps({'email': EMAIL, 'password': PASSWORD}))
+
+    def _read_until(self, path, done, results):
+        while not done.is_set():
+            results.append(self._request('GET', path))
+
+    def _report(self, label, results):
+        by_status = {}
+        for status_code, latency in results:
+            by_status.setdefault(status_code, []).append(latency)
+        for status_code, latencies in sorted(by_status.items()):
+            self.stdout.write(
+                f"  {label:<8} {status_code}: {len(latencies):>5}  p50 {percentile(latencies, 0.5):8.1f} ms  "
+                f"p99 {percentile(latencies, 0.99):8.1f} ms"
+            )
+        return by_status
+
+    def handle(self, *args, **options):
+        user, _ = User.objects.get_or_create(email=EMAIL, defaults={'name': 'Benchmark', 'role': 'User'})
+        user.set_password(PASSWORD)
+        user.save(update_fields=['password'])
+
+        total = max(1, options['requests'])
+        concurrency = max(1, options['concurrency'])
+        server = None
+        self.base_url = options['url'].rstrip('/') if options['url'] else None
+        if options['serve']:
+            server, url = start_server('wsgi', options['port'], 1, options['read_path'])
+            self.base_url = url.split('/api/')[0]
+            self.stdout.write(f"gunicorn wsgi: 1 worker, {settings.GUNICORN_THREADS} threads")
+        self.stdout.write(
+            f"{total} logins, {concurrency} concurrent; hashing pool: "
+            f"{password_hashing.workers} workers + {password_hashing.queue_size} queued"
+        )
+        try:
+            baseline = [self._request('GET', options['read_path']) for _ in range(max(1, options['baseline_reads']))]
+
+            # One reader issues the report read back to back while the logins run
+            done, reads = threading.Event(), []
+            reader = threading.Thread(target=self._read_until, args=(options['read_path'], done, reads))
+            started = time.perf_counter()
+            reader.start()
+            try:
+                with ThreadPoolExecutor(concurrency) as executor:
+                    results = list(executor.map(self._login, range(total)))
+            finally:
+                elapsed = time.perf_counter() - started
+                done.set()
+                reader.join()
+        finally:
+            User.objects.filter(pk=user.pk).delete()
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=30)
+
+        by_status = self._report('login', results)
+        self._report('read', baseline)
+        self._report('read*', reads)
+        self.stdout.write("  (read: before the storm, read*: during it)")
+        ok = len(by_status.get(200, ()))
+        self.stdout.write(f"{ok / elapsed:.1f} successful logins/s over {elapsed:.2f} s")
@@ -0,0 +1,88 @@
+import gzip
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from map.renderers.hazard_report import FastJSONRenderer, PinsRenderer
+from map.serializers.hazard_report import PIN_ROW_FIELDS, REPORT_ROW_FIELDS, serialize_report_rows
+from map.utils.pins import decode_pins
+
+TYPES = ('pothole', 'flood', 'accident', 'construction', 'fallen_tree', 'landslide')
+SEVERITIES = ('low', 'medium', 'high', 'critical')
+STATUSES = ('pending', 'approved', 'rejected')
+
+
+def _synthetic_rows(count, seed):
+    """REPORT_ROW_FIELDS tuples that look like real reports around Ho Chi Minh City."""
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+    rows = []
+    for i in range(count):
+        created = start + timedelta(seconds=rng.randint(0, 300 * 86400), microseconds=rng.randint(0, 999999))
+        report_type = rng.choice(TYPES)
+        rows.append((
+            uuid.UUID(int=rng.getrandbits(128), version=4),
+            f'{report_type.replace("_", " ").title()} #{i}',
+            'Reported by a driver passing by; the lane is partly blocked.',
+            f'Đường số {rng.randint(1, 200)}',
+            round(10.75 + rng.uniform(-0.2, 0.2), 6),
+            round(106.66 + rng.uniform(-0.2, 0.2), 6),
+            rng.choice(STATUSES),
+            report_type,
+            rng.choice(SEVERITIES),
+            created,
+            created + timedelta(minutes=rng.randint(0, 600)),
+        ))
+    return rows
+
+
+def _best_ms(function, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Command(BaseCommand):
+    help = "Compare payload size and encode time of the list JSON and the binary pins format."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Reports per payload (default 500, the max page size)')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per format; the best time is reported')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        rows = _synthetic_rows(options['rows'], options['seed'])
+        pin_index = [REPORT_ROW_FIELDS.index(name) for name in PIN_ROW_FIELDS]
+        pins = [tuple(row[i] for i in pin_index) for row in rows]
+        repeat = max(1, options['repeat'])
+
+        def page(results):
+            return {'next': None, 'previous': None, 'results': results}
+
+        cases = [
+            ('json (JSONRenderer)', lambda: JSONRenderer().render(page(serialize_report_rows(rows)))),
+            ('json (fast path, FastJSONRenderer)', lambda: FastJSONRenderer().render(page(serialize_report_rows(rows)))),
+            ('pins (PinsRenderer)', lambda: PinsRenderer().render(page(pins))),
+        ]
+
+        self.stdout.write(f"{len(rows)} reports, best of {repeat} runs")
+        self.stdout.write(f"{'format':<42}{'bytes':>10}{'gzip':>10}{'encode ms':>12}")
+        results = {}
+        for label, encode in cases:
+            elapsed, body = _best_ms(encode, repeat)
+            results[label] = body
+            self.stdout.write(f"{label:<42}{len(body):>10}{len(gzip.compress(body)):>10}{elapsed:>12.2f}")
+
+        decoded = decode_pins(results['pins (PinsRenderer)'])
+        if len(decoded['results']) != len(rows) or decoded['results'][0]['id'] != str(rows[0][0]):
+            raise CommandError("Pins payload did not decode back to the input rows.")
+        json_size = len(results['json (fast path, FastJSONRenderer)'])
+        self.stdout.write(f"pins is {json_size / max(1, len(results['pins (PinsRenderer)'])):.1f}x smaller than JSON")
@@ -0,0 +1,81 @@
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from map.models.hazard_report import HazardReport
+from map.renderers.hazard_report import FastJSONRenderer
+from map.serializers.hazard_report import (
+    REPORT_ROW_FIELDS,
+    HazardReportSerializer,
+    report_rows,
+    serialize_report_rows,
+)
+
+
+def edge_case_reports():
+    """In-memory reports with the values most likely to break parity."""
+    saigon = dt_timezone(timedelta(hours=7))
+    moment = datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=dt_timezone.utc)
+    return [
+        HazardReport(
+            id=uuid.uuid4(), name='Ổ gà "lớn"', description='line\nbreak\ttab \\ slash',
+            street_name='Nguyễn Huệ', latitude=10.7769, longitude=106.7009,
+            status='pending', type='pothole', severity='high', created_at=moment, updated_at=moment,
+        ),
+        HazardReport(
+            id=uuid.uuid4(), name='   separators', description='\x00\x01\x1f\x7f control \u2028 \u2029',
+            street_name='', latitude=None, longitude=None,
+            status='approved', type='', severity='', created_at=moment.astimezone(saigon),
+            updated_at=moment.replace(microsecond=0),
+        ),
+        HazardReport(
+            id=uuid.uuid4(), name='emoji 🚧', description='', street_name='x' * 500,
+            latitude=-0.00001, longitude=-179.999999999, status='rejected', type='flood',
+            severity='critical', created_at=moment, updated_at=moment,
+        ),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that the fast list path (values_list + serialize_report_rows + "
+        "FastJSONRenderer) renders the same bytes as HazardReportSerializer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=1000, help='Database rows to compare (0 = skip)')
+
+    def _compare(self, label, reports, rows):
+        expected = JSONRenderer().render(HazardReportSerializer(reports, many=True).data)
+        actual = FastJSONRenderer().render(serialize_report_rows(rows))
+        if expected == actual:
+            self.stdout.write(f"{label}: {len(reports)} rows OK ({len(actual)} bytes)")
+            return True
+
+        for report, row in zip(reports, rows):
+            one_expected = JSONRenderer().render(HazardReportSerializer(report).data)
+            one_actual = FastJSONRenderer().render(serialize_report_rows([row])[0])
+            if one_expected != one_actual:
+                self.stderr.write(f"{label}: mismatch for report {report.pk}")
+                self.stderr.write(f"  serializer: {one_expected!r}")
+                self.stderr.write(f"  fast path:  {one_actual!r}")
+                break
+        else:
+            self.stderr.write(f"{label}: list envelopes differ")
+        return False
+
+    def handle(self, *args, **options):
+        ok = True
+
+        reports = edge_case_reports()
+        rows = [tuple(getattr(report, name) for name in REPORT_ROW_FIELDS) for report in reports]
+        ok &= self._compare('edge cases', reports, rows)
+
+        if options['limit'] > 0:
+            queryset = HazardReport.objects.defer('search_vector').order_by('-created_at', 'id')[:options['limit']]
+            ok &= self._compare('database', list(queryset), list(report_rows(queryset)))
+
+        if not ok:
+            raise CommandError("Fast read path output differs from HazardReportSerializer.")
@@ -0,0 +1,115 @@
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+
+from map.models.user import User
+
+FIELDS = ('email', 'name', 'password', 'role')
+
+
+def _setup_worker(settings_module):
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+
+def _hash(password):
+    # None -> unusable password (user has to go through forgot-password)
+    return make_password(password or None)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users from a CSV (header: email,name,password[,role]) or NDJSON file. "
+        "Passwords are hashed across processes and rows inserted with bulk_create; "
+        "emails that already exist are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or NDJSON file ("-" is not supported)')
+        parser.add_argument('--format', choices=('csv', 'ndjson'), help='Defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows hashed and inserted per batch')
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='Hashing processes')
+        parser.add_argument('--role', default='User', help='Role for rows without one')
+
+    def _rows(self, path, fmt):
+        with open(path, newline='', encoding='utf-8') as handle:
+            if fmt == 'csv':
+                yield from csv.DictReader(handle)
+                return
+            for number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as exc:
+                    raise CommandError(f"line {number}: {exc}")
+                if not isinstance(row, dict) or not all(
+                    isinstance(row.get(field), (str, type(None))) for field in FIELDS
+                ):
+                    # Valid JSON but not a user: counted as read and skipped, like a blank email
+                    self.stderr.write(f"line {number}: expected an object of strings, skipped")
+                    row = {}
+                yield row
+
+    def _batch(self, rows, seen, default_role):
+        """Normalised new users of one batch: drops blanks, repeats and emails already in the table."""
+        users = {}
+        for row in rows:
+            email = User.objects.normalize_email((row.get('email') or '').strip())
+            if not email or email in seen or email in users:
+                continue
+            users[email] = row
+        seen.update(users)
+        existing = set(User.objects.filter(email__in=list(users)).values_list('email', flat=True))
+        return [
+            (email, row.get('name') or '', row.get('password') or '', row.get('role') or default_role)
+            for email, row in users.items() if email not in existing
+        ]
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.isfile(path):
+            raise CommandError(f"{path} does not exist")
+        fmt = options['format'] or ('ndjson' if path.endswith(('.ndjson', '.jsonl')) else 'csv')
+        batch_size = max(1, options['batch_size'])
+        processes = max(1, options['processes'])
+
+        rows = self._rows(path, fmt)
+        seen = set()
+        created = read = 0
+        started = time.perf_counter()
+        with ProcessPoolExecutor(
+            processes, initializer=_setup_worker, initargs=(os.environ['DJANGO_SETTINGS_MODULE'],),
+        ) as executor:
+            while True:
+                chunk = list(islice(rows, batch_size))
+                if not chunk:
+                    break
+                read += len(chunk)
+                batch = self._batch(chunk, seen, options['role'])
+                if not batch:
+                    continue
+                chunksize = max(1, len(batch) // (processes * 4))
+                hashes = executor.map(_hash, [password for _, _, password, _ in batch], chunksize=chunksize)
+                users = [
+                    User(email=email, name=name, password=encoded, role=role)
+                    for (email, name, _, role), encoded in zip(batch, hashes)
+                ]
+                # ignore_conflicts: ai đó đăng ký cùng email trong lúc import
+                User.objects.bulk_create(users, batch_size=batch_size, ignore_conflicts=True)
+                # Rows skipped as conflicts are not ours: count by the user_ids we generated
+                created += User.objects.filter(user_id__in=[user.user_id for user in users]).count()
+                self.stdout.write(f"{read} rows read, {created} users inserted")
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {created} of {read} rows in {elapsed:.1f} s ({read - created} skipped)"
+        ))
@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from map.models.hazard_report_tombstone import HazardReportTombstone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete hazard report tombstones older than HAZARD_SYNC_TOMBSTONE_RETENTION_DAYS. "
+        "/reports/changes/ answers older sync tokens with 410, so no client misses a delete."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Override the retention in days')
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        days = options['days']
+        if days is None:
+            days = getattr(settings, 'HAZARD_SYNC_TOMBSTONE_RETENTION_DAYS', 30)
+        cutoff = timezone.now() - timedelta(days=days)
+
+        # Batches keep each delete (and its locks) short on a large table
+        total = 0
+        while True:
+            ids = list(
+                HazardReportTombstone.objects.filter(deleted_at__lt=cutoff)
+                .order_by('deleted_at', 'id').values_list('id', flat=True)[:options['batch_size']]
+            )
+            if not ids:
+                break
+            total += HazardReportTombstone.objects.filter(id__in=ids).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f"Deleted {total} tombstones older than {days} days"))
@@ -0,0 +1,196 @@
+import random
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from map.models.hazard_report import HazardReport
+from map.models.hazard_report_code import report_codes
+from map.models.user import User
+from map.utils.response_cache import report_responses
+from map.utils.spatial_index import approved_reports
+from map.utils.tile_cache import hazard_tiles
+
+SEED_EMAIL_DOMAIN = 'seed.safemap.test'
+SEED_PASSWORD = 'seed-password'
+
+# (lat, lon, weight, spread in degrees): reports cluster around cities
+CITIES = (
+    (21.0285, 105.8542, 30, 0.08),   # Hà Nội
+    (10.7769, 106.7009, 35, 0.10),   # TP. Hồ Chí Minh
+    (16.0544, 108.2022, 10, 0.05),   # Đà Nẵng
+    (20.8449, 106.6881, 7, 0.05),    # Hải Phòng
+    (10.0452, 105.7469, 6, 0.05),    # Cần Thơ
+    (16.4637, 107.5909, 4, 0.04),    # Huế
+    (12.2388, 109.1967, 4, 0.04),    # Nha Trang
+    (11.9404, 108.4583, 3, 0.04),    # Đà Lạt
+    (18.6796, 105.6813, 3, 0.04),    # Vinh
+    (21.5942, 105.8482, 2, 0.03),    # Thái Nguyên
+)
+TYPES = (
+    ('flood', 30), ('pothole', 20), ('accident', 15), ('fallen_tree', 10),
+    ('landslide', 5), ('fire', 5), ('road_works', 10), ('power_line', 5),
+)
+STATUSES = (('approved', 60), ('pending', 30), ('rejected', 10))
+SEVERITIES = (('low', 35), ('medium', 35), ('high', 22), ('critical', 8))
+STREETS = (
+    'Nguyễn Trãi', 'Lê Lợi', 'Trần Hưng Đạo', 'Hai Bà Trưng', 'Điện Biên Phủ', 'Lý Thường Kiệt',
+    'Nguyễn Huệ', 'Võ Văn Kiệt', 'Phạm Văn Đồng', 'Cách Mạng Tháng Tám', 'Hoàng Văn Thụ', 'Láng',
+    'Giải Phóng', 'Xa Lộ Hà Nội', 'Nguyễn Văn Linh', 'Bạch Đằng', 'Trường Chinh', 'Kim Mã',
+)
+DESCRIPTIONS = {
+    'flood': "Water about {n} cm deep covering the road after heavy rain.",
+    'pothole': "Pothole roughly {n} cm wide in the right lane.",
+    'accident': "Collision involving {n} vehicles, traffic is slow.",
+    'fallen_tree': "Tree fallen across {n} lanes.",
+    'landslide': "Soil and rocks on the road over about {n} m.",
+    'fire': "Smoke visible, fire reported about {n} m from the road.",
+    'road_works': "Road works narrowing the street for {n} days.",
+    'power_line': "Power line hanging low, about {n} m of the sidewalk blocked.",
+}
+
+REPORT_COLUMNS = (
+    'id', 'name', 'user_id', 'street_name', 'latitude', 'longitude', 'description',
+    'type', 'status', 'severity', 'created_at', 'updated_at',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users and hazard reports clustered around Vietnamese cities. "
+        f"Users get @{SEED_EMAIL_DOMAIN} emails and the password '{SEED_PASSWORD}'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reports', type=int, default=10000)
+        parser.add_argument('--users', type=int, default=100, help='Report authors; 0 leaves reports anonymous')
+        parser.add_argument('--days', type=int, default=90, help='Spread created_at over the last N days')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed (same seed, same content; ids are always new)')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--bulk-create', action='store_true', help='Insert with bulk_create instead of COPY')
+        parser.add_argument('--clear', action='store_true', help='Delete previously seeded users and their reports first')
+
+    def _weighted(self, rng, choices):
+        values, weights = zip(*choices)
+        return lambda k: rng.choices(values, weights=weights, k=k)
+
+    def _users(self, count, rng):
+        seeded = User.objects.filter(email__endswith=f'@{SEED_EMAIL_DOMAIN}').order_by('id')
+        user_ids = list(seeded.values_list('user_id', flat=True)[:count])
+        # Hash once: every seeded user shares the password
+        password = make_password(SEED_PASSWORD) if len(user_ids) < count else None
+        number = seeded.count()
+        while len(user_ids) < count:
+            missing = count - len(user_ids)
+            users = [
+                User(
+                    user_id=uuid.uuid4(),
+                    email=f'user{number + i}@{SEED_EMAIL_DOMAIN}',
+                    name=f'Seed User {number + i}',
+                    password=password,
+                    role='User',
+                )
+                for i in range(missing)
+            ]
+            number += missing
+            User.objects.bulk_create(users, batch_size=1000, ignore_conflicts=True)
+            # Conflicting rows were skipped: only reference users that exist
+            user_ids = list(seeded.values_list('user_id', flat=True)[:count])
+        return user_ids
+
+    def _rows(self, count, user_ids, rng, days):
+        now = timezone.now()
+        pick_city = self._weighted(rng, [(city, city[2]) for city in CITIES])
+        pick_type = self._weighted(rng, TYPES)
+        pick_status = self._weighted(rng, STATUSES)
+        pick_severity = self._weighted(rng, SEVERITIES)
+        cities, types = pick_city(count), pick_type(count)
+        statuses, severities = pick_status(count), pick_severity(count)
+
+        for i in range(count):
+            lat0, lon0, _, spread = cities[i]
+            street = rng.choice(STREETS)
+            report_type = types[i]
+            created_at = now - timedelta(seconds=rng.randint(0, days * 86400))
+            updated_at = min(now, created_at + timedelta(seconds=rng.randint(0, 3 * 86400)))
+            yield (
+                uuid.uuid4(),
+                f"{report_type.replace('_', ' ').capitalize()} on {street}",
+                rng.choice(user_ids) if user_ids else None,
+                street,
+                round(max(-90.0, min(90.0, rng.gauss(lat0, spread))), 6),
+                round(rng.gauss(lon0, spread), 6),
+                DESCRIPTIONS[report_type].format(n=rng.randint(2, 80)),
+                report_type,
+                statuses[i],
+                severities[i],
+                created_at,
+                updated_at,
+            )
+
+    def _copy(self, rows):
+        """COPY rows into hazard_report; labels are written as their codes."""
+        coded = [REPORT_COLUMNS.index(name) for name in ('type', 'status', 'severity')]
+        # Resolved before COPY starts: the connection cannot run other queries
+        # during it, and inside the transaction report_codes only caches new
+        # labels on commit
+        codes = {
+            (REPORT_COLUMNS[index], row[index]): None for row in rows for index in coded
+        }
+        for key in codes:
+            codes[key] = report_codes.code(*key, create=True)
+        sql = f"COPY hazard_report ({', '.join(REPORT_COLUMNS)}) FROM STDIN"
+        with connection.cursor() as cursor, cursor.copy(sql) as copy:
+            for row in rows:
+                row = list(row)
+                for index in coded:
+                    row[index] = codes[(REPORT_COLUMNS[index], row[index])]
+                copy.write_row(row)
+
+    def _bulk_create(self, rows, batch_size):
+        HazardReport.objects.bulk_create(
+            [HazardReport(**dict(zip(REPORT_COLUMNS, row))) for row in rows], batch_size=batch_size,
+        )
+
+    def handle(self, *args, **options):
+        count = options['reports']
+        if count < 0 or options['users'] < 0:
+            raise CommandError("--reports and --users must not be negative")
+        rng = random.Random(options['seed'])
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            if options['clear']:
+                seeded = User.objects.filter(email__endswith=f'@{SEED_EMAIL_DOMAIN}')
+                deleted, _ = HazardReport.objects.filter(user__in=seeded).delete()
+                seeded.delete()
+                self.stdout.write(f"Cleared {deleted} seeded reports")
+
+            user_ids = self._users(options['users'], rng)
+            batch_size = max(1, options['batch_size'])
+            rows = self._rows(count, user_ids, rng, options['days'])
+            inserted = 0
+            while inserted < count:
+                batch = [row for _, row in zip(range(batch_size), rows)]
+                if options['bulk_create']:
+                    self._bulk_create(batch, batch_size)
+                else:
+                    self._copy(batch)
+                inserted += len(batch)
+                self.stdout.write(f"{inserted}/{count} reports")
+
+        # Rows bypassed the viewset hooks; other processes' in-memory indexes
+        # catch up within HAZARD_INDEX_MAX_AGE
+        report_responses.bump_version()
+        approved_reports.reset()
+        hazard_tiles.clear()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(user_ids)} users and {count} reports in {elapsed:.1f} s "
+            f"({count / elapsed if elapsed else 0:.0f} reports/s)"
+        ))
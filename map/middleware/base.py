@@ -0,0 +1,19 @@
+from django.utils.deprecation import MiddlewareMixin
+
+
+class InlineMiddlewareMixin(MiddlewareMixin):
+    """
+    MiddlewareMixin for hooks that never block (no database or network).
+
+    Under ASGI, MiddlewareMixin runs process_request/process_response in a
+    sync_to_async thread hop each; these run them on the event loop instead.
+    """
+
+    async def __acall__(self, request):
+        response = None
+        if hasattr(self, 'process_request'):
+            response = self.process_request(request)
+        response = response or await self.get_response(request)
+        if hasattr(self, 'process_response'):
+            response = self.process_response(request, response)
+        return response
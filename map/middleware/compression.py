@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from map.middleware.base import InlineMiddlewareMixin
+from map.utils.compression import acompress_stream, choose_encoding, compress, compress_stream
+
+# Already compressed formats: recompressing them only costs CPU
+SKIP_CONTENT_TYPES = ('image/', 'video/', 'audio/', 'application/zip', 'application/gzip', 'font/woff')
+# Each write must reach the client right away, not wait for a compressed block
+UNBUFFERED_CONTENT_TYPES = ('text/event-stream',)
+
+
+class CompressionMiddleware(InlineMiddlewareMixin):
+    """
+    Brotli/gzip for API responses, negotiated from Accept-Encoding.
+
+    Like django.middleware.gzip.GZipMiddleware, plus brotli, a size
+    threshold (HAZARD_COMPRESS_MIN_SIZE) and streaming bodies compressed
+    in HAZARD_COMPRESS_FLUSH_SIZE blocks instead of per chunk. Responses
+    that already carry Content-Encoding (the precompressed feed cache) are
+    passed through untouched.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+
+        min_size = getattr(settings, 'HAZARD_COMPRESS_MIN_SIZE', 1024)
+        if not response.streaming and len(response.content) < min_size:
+            return response
+
+        content_type = response.get('Content-Type', '')
+        if content_type.startswith(SKIP_CONTENT_TYPES + UNBUFFERED_CONTENT_TYPES):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            flush_size = getattr(settings, 'HAZARD_COMPRESS_FLUSH_SIZE', 32768)
+            if response.is_async:
+                response.streaming_content = acompress_stream(response.streaming_content, encoding, flush_size)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding, flush_size)
+            del response.headers['Content-Length']
+        else:
+            compressed = compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # Body differs from the identity one, so a strong ETag becomes weak (RFC 9110 8.8.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+
+from map.middleware.base import InlineMiddlewareMixin
+
+PIN_COOKIE = 'hazard_primary_until'
+PIN_HEADER = 'X-Primary-Until'
+
+
+class PrimaryPinMiddleware(InlineMiddlewareMixin):
+    """
+    Read-your-own-writes for replica reads.
+
+    A successful write answers with the time until which the client should
+    read the primary, both as a cookie and as an X-Primary-Until header
+    (for clients without a cookie jar, which send the header back). While
+    either is in the future, request.read_primary is True and the report
+    read endpoints skip the replicas.
+    """
+
+    def _pinned_until(self, request):
+        for value in (request.COOKIES.get(PIN_COOKIE), request.META.get('HTTP_X_PRIMARY_UNTIL')):
+            try:
+                yield float(value)
+            except (TypeError, ValueError):
+                continue
+
+    def process_request(self, request):
+        now = time.time()
+        request.read_primary = any(until > now for until in self._pinned_until(request))
+
+    def process_response(self, request, response):
+        if request.method in ('GET', 'HEAD', 'OPTIONS') or response.status_code >= 400:
+            return response
+        seconds = getattr(settings, 'HAZARD_PRIMARY_PIN_SECONDS', 5)
+        until = f'{time.time() + seconds:.3f}'
+        response.set_cookie(PIN_COOKIE, until, max_age=seconds, httponly=True, samesite='Lax')
+        response[PIN_HEADER] = until
+        return response
@@ -0,0 +1,94 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+def _to_float(value, limit):
+    try:
+        number = float(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    if not (-limit <= number <= limit):
+        return None
+    return number
+
+
+def copy_coordinates_to_numeric(apps, schema_editor):
+    HazardReport = apps.get_model('map', 'HazardReport')
+    batch = []
+    rows = HazardReport.objects.values_list('id', 'latitude', 'longitude').iterator(chunk_size=2000)
+    for report_id, latitude, longitude in rows:
+        batch.append(HazardReport(
+            id=report_id,
+            latitude_num=_to_float(latitude, 90.0),
+            longitude_num=_to_float(longitude, 180.0),
+        ))
+        if len(batch) >= 2000:
+            HazardReport.objects.bulk_update(batch, ['latitude_num', 'longitude_num'])
+            batch = []
+    if batch:
+        HazardReport.objects.bulk_update(batch, ['latitude_num', 'longitude_num'])
+
+
+def copy_coordinates_to_text(apps, schema_editor):
+    HazardReport = apps.get_model('map', 'HazardReport')
+    batch = []
+    rows = HazardReport.objects.values_list('id', 'latitude_num', 'longitude_num').iterator(chunk_size=2000)
+    for report_id, latitude, longitude in rows:
+        batch.append(HazardReport(
+            id=report_id,
+            latitude='' if latitude is None else str(latitude),
+            longitude='' if longitude is None else str(longitude),
+        ))
+        if len(batch) >= 2000:
+            HazardReport.objects.bulk_update(batch, ['latitude', 'longitude'])
+            batch = []
+    if batch:
+        HazardReport.objects.bulk_update(batch, ['latitude', 'longitude'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('map', '0010_hazardreport_user'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='hazardreport',
+            name='hazard_repo_latitud_92d892_idx',
+        ),
+        migrations.AddField(
+            model_name='hazardreport',
+            name='latitude_num',
+            field=models.FloatField(null=True),
+        ),
+        migrations.AddField(
+            model_name='hazardreport',
+            name='longitude_num',
+            field=models.FloatField(null=True),
+        ),
+        migrations.RunPython(copy_coordinates_to_numeric, copy_coordinates_to_text),
+        migrations.RemoveField(
+            model_name='hazardreport',
+            name='latitude',
+        ),
+        migrations.RemoveField(
+            model_name='hazardreport',
+            name='longitude',
+        ),
+        migrations.RenameField(
+            model_name='hazardreport',
+            old_name='latitude_num',
+            new_name='latitude',
+        ),
+        migrations.RenameField(
+            model_name='hazardreport',
+            old_name='longitude_num',
+            new_name='longitude',
+        ),
+        migrations.AddIndex(
+            model_name='hazardreport',
+            index=models.Index(fields=['latitude', 'longitude'], name='hazard_repo_latitud_92d892_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('map', '0011_hazardreport_numeric_coordinates'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='hazardreport',
+            name='hazard_repo_created_e2c60a_idx',
+        ),
+        migrations.AddIndex(
+            model_name='hazardreport',
+            index=models.Index(fields=['created_at', 'id'], name='hazard_repo_created_3c764a_idx'),
+        ),
+    ]
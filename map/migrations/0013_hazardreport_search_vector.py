@@ -0,0 +1,61 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:29
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# 'simple' config: reports are mostly Vietnamese, which has no stemmer, so
+# words are indexed as-is (lower-cased). Name weighs most, then street,
+# description, and finally the short type/status/severity labels.
+SEARCH_VECTOR_SQL = """
+CREATE OR REPLACE FUNCTION hazard_report_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.street_name, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'C') ||
+        setweight(to_tsvector('simple',
+            coalesce(NEW.type, '') || ' ' || coalesce(NEW.status, '') || ' ' || coalesce(NEW.severity, '')
+        ), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER hazard_report_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, street_name, description, type, status, severity, search_vector
+    ON hazard_report
+    FOR EACH ROW EXECUTE FUNCTION hazard_report_search_vector_update();
+
+UPDATE hazard_report SET name = name;
+"""
+
+DROP_SEARCH_VECTOR_SQL = """
+DROP TRIGGER IF EXISTS hazard_report_search_vector_trigger ON hazard_report;
+DROP FUNCTION IF EXISTS hazard_report_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('map', '0012_hazardreport_created_at_id_index'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='hazardreport',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(SEARCH_VECTOR_SQL, DROP_SEARCH_VECTOR_SQL),
+        migrations.AddIndex(
+            model_name='hazardreport',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='hazard_report_search_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='hazardreport',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['street_name'], name='hazard_report_street_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:33
+
+import django.utils.timezone
+from django.db import migrations, models
+
+# clock_timestamp() rather than now(): a long transaction must not log its
+# deletes with a time that delta-sync clients have already moved past.
+TOMBSTONE_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION hazard_report_tombstone_insert() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO hazard_report_tombstone (report_id, deleted_at) VALUES (OLD.id, clock_timestamp());
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER hazard_report_tombstone_trigger
+    AFTER DELETE ON hazard_report
+    FOR EACH ROW EXECUTE FUNCTION hazard_report_tombstone_insert();
+"""
+
+DROP_TOMBSTONE_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS hazard_report_tombstone_trigger ON hazard_report;
+DROP FUNCTION IF EXISTS hazard_report_tombstone_insert();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('map', '0013_hazardreport_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HazardReportTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report_id', models.UUIDField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'hazard_report_tombstone',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='hazardreport',
+            index=models.Index(fields=['updated_at', 'id'], name='hazard_repo_updated_eab37e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hazardreporttombstone',
+            index=models.Index(fields=['deleted_at', 'id'], name='hazard_repo_deleted_7f57c6_idx'),
+        ),
+        migrations.RunSQL(TOMBSTONE_TRIGGER_SQL, DROP_TOMBSTONE_TRIGGER_SQL),
+    ]
@@ -0,0 +1,160 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:15
+
+import map.models.hazard_report_code
+from django.db import migrations, models
+
+LABEL_FIELDS = ('status', 'type', 'severity')
+
+SEED_CODES_SQL = """
+INSERT INTO hazard_report_code (id, field, name) VALUES
+    (1, 'status', 'pending'), (2, 'status', 'approved'), (3, 'status', 'rejected'),
+    (10, 'severity', ''), (11, 'severity', 'low'), (12, 'severity', 'medium'),
+    (13, 'severity', 'high'), (14, 'severity', 'critical'),
+    (20, 'type', '');
+SELECT setval(pg_get_serial_sequence('hazard_report_code', 'id'), 100);
+"""
+
+# The search trigger lists type/status/severity in UPDATE OF, and Postgres
+# refuses to change the type of a column a trigger depends on.
+DROP_SEARCH_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS hazard_report_search_vector_trigger ON hazard_report;
+"""
+
+TEXT_SEARCH_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION hazard_report_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.street_name, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'C') ||
+        setweight(to_tsvector('simple',
+            coalesce(NEW.type, '') || ' ' || coalesce(NEW.status, '') || ' ' || coalesce(NEW.severity, '')
+        ), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER hazard_report_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, street_name, description, type, status, severity, search_vector
+    ON hazard_report
+    FOR EACH ROW EXECUTE FUNCTION hazard_report_search_vector_update();
+"""
+
+# Same document as before: the D-weight labels are looked up by code.
+CODED_SEARCH_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION hazard_report_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.street_name, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.description, '')), 'C') ||
+        setweight(to_tsvector('simple',
+            coalesce((SELECT name FROM hazard_report_code WHERE id = NEW.type), '') || ' ' ||
+            coalesce((SELECT name FROM hazard_report_code WHERE id = NEW.status), '') || ' ' ||
+            coalesce((SELECT name FROM hazard_report_code WHERE id = NEW.severity), '')
+        ), 'D');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER hazard_report_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, street_name, description, type, status, severity, search_vector
+    ON hazard_report
+    FOR EACH ROW EXECUTE FUNCTION hazard_report_search_vector_update();
+"""
+
+COPY_LABELS_TO_CODES_SQL = """
+INSERT INTO hazard_report_code (field, name)
+    SELECT DISTINCT 'status', status FROM hazard_report
+    UNION SELECT DISTINCT 'type', type FROM hazard_report
+    UNION SELECT DISTINCT 'severity', severity FROM hazard_report
+ON CONFLICT (field, name) DO NOTHING;
+
+UPDATE hazard_report r
+SET status_code = s.id, type_code = t.id, severity_code = v.id
+FROM hazard_report_code s, hazard_report_code t, hazard_report_code v
+WHERE s.field = 'status' AND s.name = r.status
+  AND t.field = 'type' AND t.name = r.type
+  AND v.field = 'severity' AND v.name = r.severity;
+"""
+
+COPY_CODES_TO_LABELS_SQL = """
+UPDATE hazard_report r
+SET status = s.name, type = t.name, severity = v.name
+FROM hazard_report_code s, hazard_report_code t, hazard_report_code v
+WHERE s.id = r.status_code AND t.id = r.type_code AND v.id = r.severity_code;
+"""
+
+
+def _code_columns():
+    operations = []
+    for field in LABEL_FIELDS:
+        operations.append(migrations.AddField(
+            model_name='hazardreport',
+            name=f'{field}_code',
+            field=models.SmallIntegerField(null=True),
+        ))
+    return operations
+
+
+def _swap_columns():
+    operations = []
+    for field in LABEL_FIELDS:
+        operations += [
+            migrations.RemoveField(model_name='hazardreport', name=field),
+            migrations.RenameField(model_name='hazardreport', old_name=f'{field}_code', new_name=field),
+        ]
+    return operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('map', '0014_hazardreport_tombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HazardReportCode',
+            fields=[
+                ('id', models.SmallAutoField(primary_key=True, serialize=False)),
+                ('field', models.TextField()),
+                ('name', models.TextField()),
+            ],
+            options={
+                'db_table': 'hazard_report_code',
+                'constraints': [
+                    models.UniqueConstraint(fields=('field', 'name'), name='hazard_report_code_field_name_uniq'),
+                ],
+            },
+        ),
+        migrations.RunSQL(SEED_CODES_SQL, migrations.RunSQL.noop),
+        migrations.RunSQL(DROP_SEARCH_TRIGGER_SQL, TEXT_SEARCH_TRIGGER_SQL),
+        *_code_columns(),
+        migrations.RunSQL(COPY_LABELS_TO_CODES_SQL, COPY_CODES_TO_LABELS_SQL),
+        *_swap_columns(),
+        migrations.AlterField(
+            model_name='hazardreport',
+            name='severity',
+            field=map.models.hazard_report_code.CodedTextField(default=''),
+        ),
+        migrations.AlterField(
+            model_name='hazardreport',
+            name='status',
+            field=map.models.hazard_report_code.CodedTextField(default='pending'),
+        ),
+        migrations.AlterField(
+            model_name='hazardreport',
+            name='type',
+            field=map.models.hazard_report_code.CodedTextField(default=''),
+        ),
+        migrations.RunSQL(CODED_SEARCH_TRIGGER_SQL, DROP_SEARCH_TRIGGER_SQL),
+        migrations.AddIndex(
+            model_name='hazardreport',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['-created_at', '-id'], name='hazard_report_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hazardreport',
+            index=models.Index(condition=models.Q(('status', 'approved')), fields=['-created_at', '-id'], name='hazard_report_approved_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('map', '0015_hazardreport_coded_labels'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hazardreport',
+            index=models.Index(fields=['user', 'status', '-created_at', '-id'], name='hazard_report_user_status_idx'),
+        ),
+    ]
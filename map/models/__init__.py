@@ -1,2 +1,4 @@
 from .user import User
-from .hazard_report import HazardReport
\ No newline at end of file
+from .hazard_report_code import HazardReportCode
+from .hazard_report import HazardReport
+from .hazard_report_tombstone import HazardReportTombstone
\ No newline at end of file
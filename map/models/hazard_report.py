@@ -1,11 +1,58 @@
 from datetime import timedelta
 import uuid
 from django.utils import timezone
-from django.db import models
+from django.db import connections, models, router
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
+from map.models.hazard_report_code import CodedTextField, report_codes
 from map.models.user import User
 
 
+class HazardReportQuerySet(models.QuerySet):
+    RETURNING = 'id, user_id, name, latitude, longitude, type, severity'
+
+    def _write_db(self):
+        return self._db or router.db_for_write(self.model)
+
+    def _set_status(self, where_sql, params, status):
+        connection = connections[self._write_db()]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        code = self.model._meta.get_field('status').get_db_prep_save(status, connection)
+        sql = (
+            f'UPDATE {table} SET status = %s, updated_at = %s '
+            f'WHERE {where_sql} AND status <> %s '
+            f'RETURNING {self.RETURNING}'
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [code, timezone.now(), *params, code])
+            rows = cursor.fetchall()
+        # type/severity come back as codes
+        return [
+            (
+                report_id, user_id, name, lat, lon,
+                report_codes.name(report_type, connection.alias), report_codes.name(severity, connection.alias),
+            )
+            for report_id, user_id, name, lat, lon, report_type, severity in rows
+        ]
+
+    def set_status(self, status):
+        """
+        Move every report in this queryset to ``status`` with one UPDATE.
+
+        Rows already in that status are left alone; the others also get
+        updated_at (QuerySet.update() would skip auto_now). Returns
+        (id, user_id, name, latitude, longitude, type, severity) for each
+        changed row.
+        """
+        ids_sql, params = self.values('id').query.get_compiler(self._write_db()).as_sql()
+        return self._set_status(f'id IN ({ids_sql})', params, status)
+
+    def set_status_by_ids(self, ids, status):
+        """Same as set_status(), as a single ``WHERE id = ANY(%s)``."""
+        return self._set_status('id = ANY(%s)', [list(ids)], status)
+
+
 class HazardReport(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
@@ -21,21 +68,41 @@ class HazardReport(models.Model):
 
     # Location fields
     street_name = models.TextField(default="")
-    latitude = models.TextField(default="")
-    longitude = models.TextField(default="")
+    latitude = models.FloatField(null=True)
+    longitude = models.FloatField(null=True)
 
     # Description
     description = models.TextField(blank=True, help_text="Detailed description in English")
-    type = models.TextField(default="")
-    status = models.TextField(default="pending")
-    severity = models.TextField(default="")
+    # Stored as smallint codes (hazard_report_code), read and written as strings
+    type = CodedTextField(default="")
+    status = CodedTextField(default="pending")
+    severity = CodedTextField(default="")
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    # Full-text search, maintained by a DB trigger (migration 0013)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = HazardReportQuerySet.as_manager()
+
     class Meta:
         db_table = 'hazard_report'
         indexes = [ 
             models.Index(fields=['street_name']),
             models.Index(fields=['latitude', 'longitude']),
-            models.Index(fields=['created_at']),
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['updated_at', 'id']),
+            # "My reports": one user's reports by status, newest first
+            models.Index(fields=['user', 'status', '-created_at', '-id'], name='hazard_report_user_status_idx'),
+            # Moderation queue and approved feed: newest-first range scans of one status
+            models.Index(
+                fields=['-created_at', '-id'], name='hazard_report_pending_idx',
+                condition=models.Q(status='pending'),
+            ),
+            models.Index(
+                fields=['-created_at', '-id'], name='hazard_report_approved_idx',
+                condition=models.Q(status='approved'),
+            ),
+            GinIndex(fields=['search_vector'], name='hazard_report_search_gin'),
+            GinIndex(fields=['street_name'], name='hazard_report_street_trgm', opclasses=['gin_trgm_ops']),
         ]
@@ -0,0 +1,181 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import models, router, transaction
+from django.db.models import OuterRef, Subquery
+from django.utils.functional import cached_property
+
+# Codes inserted by migration 0015. Fixed so partial index conditions and
+# defaults compile without a database round trip; new labels start at 101.
+SEEDED_CODES = (
+    ('status', 'pending', 1),
+    ('status', 'approved', 2),
+    ('status', 'rejected', 3),
+    ('severity', '', 10),
+    ('severity', 'low', 11),
+    ('severity', 'medium', 12),
+    ('severity', 'high', 13),
+    ('severity', 'critical', 14),
+    ('type', '', 20),
+)
+
+# Matches no row: used when filtering on a label that has never been saved
+UNKNOWN_CODE = -1
+
+
+class HazardReportCode(models.Model):
+    """
+    Lookup table behind HazardReport's coded status/type/severity columns.
+    Append-only: a label keeps its code forever.
+    """
+    id = models.SmallAutoField(primary_key=True)
+    field = models.TextField()
+    name = models.TextField()
+
+    class Meta:
+        db_table = 'hazard_report_code'
+        constraints = [
+            models.UniqueConstraint(fields=['field', 'name'], name='hazard_report_code_field_name_uniq'),
+        ]
+
+
+class ReportCodeRegistry:
+    """
+    In-process map between labels and hazard_report_code ids.
+
+    Ids come from a sequence that never rolls back, so code -> name entries
+    can be cached as soon as they are seen. A name -> code entry is only
+    cached once its row is committed; otherwise a label inserted by a rolled
+    back transaction would keep being written under a code no other process
+    can resolve.
+
+    Labels that do not exist (filters such as ?status=typo) are remembered
+    for HAZARD_CODE_MISS_TTL seconds, so repeating them does not query the
+    table each time; a label another process creates meanwhile is matched
+    once that expires. At most MAX_MISSES are kept.
+    """
+    MAX_MISSES = 1024
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._names = {code: name for _, name, code in SEEDED_CODES}
+        self._codes = {(field, name): code for field, name, code in SEEDED_CODES}
+        # (field, name) -> time.monotonic() deadline
+        self._misses = {}
+
+    def _remember(self, field, name, code, using):
+        self._names[code] = name
+        self._misses.pop((field, name), None)
+        if transaction.get_connection(using).in_atomic_block:
+            transaction.on_commit(lambda: self._codes.__setitem__((field, name), code), using=using)
+        else:
+            self._codes[(field, name)] = code
+
+    def name(self, code, using=None):
+        try:
+            return self._names[code]
+        except KeyError:
+            pass
+        using = using or router.db_for_read(HazardReportCode)
+        # A replica may not have the row of a label created moments ago yet
+        primary = router.db_for_write(HazardReportCode)
+        with self._lock:
+            for alias in dict.fromkeys((using, primary)):
+                rows = HazardReportCode.objects.using(alias).values_list('field', 'name', 'id')
+                for field, name, known in rows:
+                    self._remember(field, name, known, alias)
+                if code in self._names:
+                    break
+        return self._names.get(code, '')
+
+    def code(self, field, name, using=None, create=False):
+        """
+        Code of ``name`` in ``field``. With create=True a missing label is
+        inserted; otherwise None is returned for it.
+        """
+        key = (field, name)
+        code = self._codes.get(key)
+        if code is not None:
+            return code
+        if not create and self._misses.get(key, 0) > time.monotonic():
+            return None
+
+        using = using or router.db_for_write(HazardReportCode)
+        codes = HazardReportCode.objects.using(using).filter(field=field, name=name).values_list('id', flat=True)
+        code = codes.first()
+        if code is None and create:
+            HazardReportCode.objects.using(using).bulk_create(
+                [HazardReportCode(field=field, name=name)], ignore_conflicts=True,
+            )
+            code = codes.first()
+        if code is not None:
+            self._remember(field, name, code, using)
+        else:
+            if len(self._misses) >= self.MAX_MISSES:
+                self._misses.clear()
+            self._misses[key] = time.monotonic() + getattr(settings, 'HAZARD_CODE_MISS_TTL', 5)
+        return code
+
+
+report_codes = ReportCodeRegistry()
+
+
+class CodedTextField(models.SmallIntegerField):
+    """
+    A short label (status, type, severity) stored as a smallint code.
+
+    Model instances, ORM lookups, values_list() and the API all keep using
+    the string; only the column is an integer. Saving an unseen label
+    gives it a new code, while filtering on one matches nothing.
+
+    order_by() on the column itself sorts by code (pending < approved <
+    rejected); order by label() for the alphabetical order the text
+    columns had, as KeysetPagination does for ?ordering=status.
+    """
+
+    def __init__(self, *args, vocabulary=None, **kwargs):
+        self.vocabulary = vocabulary
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.vocabulary is not None:
+            kwargs['vocabulary'] = self.vocabulary
+        return name, path, args, kwargs
+
+    @property
+    def code_field(self):
+        """hazard_report_code.field of this column's labels: ``vocabulary`` or the field name."""
+        return self.vocabulary or self.name
+
+    def label(self):
+        """This column's label as an expression (subquery on hazard_report_code)."""
+        names = HazardReportCode.objects.filter(id=OuterRef(self.name)).values('name')[:1]
+        return Subquery(names, output_field=models.TextField())
+
+    @cached_property
+    def validators(self):
+        # IntegerField's range validators do not apply to the label
+        return [*self.default_validators, *self._validators]
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return report_codes.name(value, connection.alias)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        return report_codes.name(int(value))
+
+    def get_prep_value(self, value):
+        if value is None or isinstance(value, int):
+            return value
+        code = report_codes.code(self.code_field, str(value))
+        return UNKNOWN_CODE if code is None else code
+
+    def get_db_prep_save(self, value, connection):
+        if value is None or isinstance(value, int) or hasattr(value, 'as_sql'):
+            return value
+        return report_codes.code(self.code_field, str(value), using=connection.alias, create=True)
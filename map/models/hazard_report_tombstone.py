@@ -0,0 +1,18 @@
+from django.utils import timezone
+from django.db import models
+
+
+class HazardReportTombstone(models.Model):
+    """
+    One row per deleted HazardReport, written by a database trigger
+    (migration 0014) so cascades and raw deletes are logged too.
+    Lets /reports/changes/ tell offline clients what to drop.
+    """
+    report_id = models.UUIDField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'hazard_report_tombstone'
+        indexes = [
+            models.Index(fields=['deleted_at', 'id']),
+        ]
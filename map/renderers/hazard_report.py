@@ -0,0 +1,143 @@
+# map/renderers/hazard_report.py
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+from map.utils.pins import encode_pins
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+
+class MVTRenderer(BaseRenderer):
+    """Passes pre-encoded Mapbox Vector Tile bytes through untouched."""
+    media_type = 'application/vnd.mapbox-vector-tile'
+    format = 'mvt'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, (bytes, bytearray)):
+            return bytes(data)
+        return b''
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    Output is byte-for-byte the same as JSONRenderer for dicts/lists of
+    strings, None, bools and ints, which is what serialize_report_rows()
+    produces. orjson formats some floats differently (1e-5 vs 1e-05), so
+    keep this renderer off payloads that carry floats. Indented output and
+    anything orjson refuses fall back to JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except (orjson.JSONEncodeError, TypeError):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same as JSONRenderer: \u2028/\u2029 escaped so the output is valid JavaScript
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class PinsRenderer(BaseRenderer):
+    """
+    Columnar binary map pins (see map/utils/pins.py), chosen with
+    ``Accept: application/vnd.safemap.pins`` or ``?format=pins``.
+
+    Expects a paginated response whose results are pin_rows() tuples;
+    anything else (errors) is sent as plain JSON.
+    """
+    media_type = 'application/vnd.safemap.pins'
+    format = 'pins'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not isinstance(data, dict) or 'results' not in data:
+            return JSONRenderer().render(data)
+        return encode_pins(data['results'], next=data.get('next'), previous=data.get('previous'))
+
+
+class StreamingExportRenderer(BaseRenderer):
+    """
+    Base for the /reports/export/ formats.
+
+    The export view streams rows through ``stream()``; ``render()`` is only
+    used for error responses, which are sent as plain JSON.
+    """
+    charset = 'utf-8'
+    extension = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data, cls=DjangoJSONEncoder).encode('utf-8')
+
+    def stream(self, rows, fields):
+        """Yield encoded chunks for an iterable of serialized report dicts."""
+        raise NotImplementedError
+
+
+class NDJSONRenderer(StreamingExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    extension = 'ndjson'
+
+    def stream(self, rows, fields):
+        for row in rows:
+            yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+class GeoJSONRenderer(StreamingExportRenderer):
+    media_type = 'application/geo+json'
+    format = 'geojson'
+    extension = 'geojson'
+
+    def stream(self, rows, fields):
+        yield '{"type":"FeatureCollection","features":['
+        separator = ''
+        for row in rows:
+            properties = dict(row)
+            lat = properties.pop('latitude', None)
+            lon = properties.pop('longitude', None)
+            geometry = None
+            if lat not in (None, '') and lon not in (None, ''):
+                geometry = {'type': 'Point', 'coordinates': [float(lon), float(lat)]}
+            feature = {'type': 'Feature', 'id': properties.get('id'), 'geometry': geometry, 'properties': properties}
+            yield separator + json.dumps(feature, cls=DjangoJSONEncoder)
+            separator = ','
+        yield ']}'
+
+
+class _EchoBuffer:
+    def write(self, value):
+        return value
+
+
+class CSVRenderer(StreamingExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+    extension = 'csv'
+
+    def stream(self, rows, fields):
+        writer = csv.writer(_EchoBuffer())
+        yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow(['' if row.get(field) is None else row[field] for field in fields])
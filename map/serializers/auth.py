@@ -2,11 +2,11 @@ from django.utils import timezone
 import re
 from django.core.exceptions import ObjectDoesNotExist
 from rest_framework import serializers
-from django.contrib.auth.hashers import make_password, check_password
 from django.utils.crypto import get_random_string
 from django.core.mail import send_mail
 from django.conf import settings
 
+from map.authentication.passwords import password_hashing, verify_password
 from map.models.user import User
 
 class LoginSerializer(serializers.Serializer):
@@ -22,8 +22,13 @@ class LoginSerializer(serializers.Serializer):
         except User.DoesNotExist:
             raise serializers.ValidationError("Login failed, wrong email or password")
 
-        if not check_password(password, user.password):
+        # Băm mật khẩu chạy trong pool riêng, có thể raise PasswordHashingBusy
+        valid, upgraded = password_hashing.run(verify_password, password, user.password)
+        if not valid:
             raise serializers.ValidationError("Login failed, wrong email or password")
+        if upgraded:
+            User.objects.filter(pk=user.pk).update(password=upgraded)
+            user.password = upgraded
         return user
     
     
@@ -1,11 +1,21 @@
 # map/serializers/hazard_report.py
+import uuid
+
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
 from map.models.hazard_report import HazardReport
+from map.models.user import User
+from map.utils.geo import parse_bbox
 
 class HazardReportSerializer(serializers.ModelSerializer):
-    # Model đang dùng TextField cho lat/long, ta vẫn validate phạm vi số:
+    # Model lưu lat/long dạng số, API vẫn nhận và trả về chuỗi:
     latitude = serializers.CharField()
     longitude = serializers.CharField()
+    # Cột lưu mã smallint (CodedTextField), API vẫn dùng chuỗi như trước:
+    status = serializers.CharField(required=False)
+    type = serializers.CharField(required=False)
+    severity = serializers.CharField(required=False)
     user_id = serializers.UUIDField(write_only=True)
 
     class Meta:
@@ -14,20 +24,185 @@ class HazardReportSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
     def validate(self, attrs):
-        lat = attrs.get('latitude', None)
-        lon = attrs.get('longitude', None)
-
         # ✅ Chỉ validate nếu có truyền vào
-        if lat is not None and lon is not None:
+        for field, limit in (('latitude', 90.0), ('longitude', 180.0)):
+            value = attrs.get(field, None)
+            if value is None:
+                continue
+
             try:
-                lat_f = float(lat)
-                lon_f = float(lon)
+                value = float(value)
             except (TypeError, ValueError):
                 raise serializers.ValidationError("latitude and longitude must be numeric.")
 
-            if not (-90.0 <= lat_f <= 90.0):
-                raise serializers.ValidationError("latitude must be between -90 and 90.")
-            if not (-180.0 <= lon_f <= 180.0):
-                raise serializers.ValidationError("longitude must be between -180 and 180.")
-        
+            if not (-limit <= value <= limit):
+                raise serializers.ValidationError(f"{field} must be between -{limit:g} and {limit:g}.")
+            attrs[field] = value
+
+        return attrs
+
+
+# Fast read path: the readable fields of HazardReportSerializer, in the same order
+REPORT_ROW_FIELDS = (
+    'id', 'name', 'description', 'street_name', 'latitude', 'longitude',
+    'status', 'type', 'severity', 'created_at', 'updated_at',
+)
+REPORT_ROW_DATETIME_FIELDS = ('created_at', 'updated_at')
+
+
+def report_rows(queryset, extra=()):
+    """
+    ``values_list(named=True)`` of REPORT_ROW_FIELDS plus any ``extra``
+    columns (e.g. the keyset ordering field), so list endpoints skip model
+    instantiation entirely.
+    """
+    fields = REPORT_ROW_FIELDS + tuple(name for name in extra if name not in REPORT_ROW_FIELDS)
+    return queryset.values_list(*fields, named=True)
+
+
+# Compact "map pins" format (map/utils/pins.py): id, coordinates and the coded fields
+PIN_ROW_FIELDS = ('id', 'latitude', 'longitude', 'type', 'severity', 'status')
+
+
+def pin_rows(queryset, extra=()):
+    """report_rows() for the pins format: PIN_ROW_FIELDS first, then ``extra``."""
+    fields = PIN_ROW_FIELDS + tuple(name for name in extra if name not in PIN_ROW_FIELDS)
+    return queryset.values_list(*fields, named=True)
+
+
+def serialize_report_rows(rows):
+    """
+    Turn report_rows() tuples into the same dicts HazardReportSerializer
+    (many=True) returns: ids and coordinates as strings, datetimes as DRF's
+    ISO 8601 in the current time zone. check_report_serialization verifies
+    the rendered bytes match.
+    """
+    tz = timezone.get_current_timezone() if settings.USE_TZ else None
+    names = REPORT_ROW_FIELDS
+    datetime_fields = REPORT_ROW_DATETIME_FIELDS
+    data = []
+    for row in rows:
+        item = {}
+        for name, value in zip(names, row):
+            if value is None:
+                item[name] = None
+            elif name in datetime_fields:
+                if tz is not None and timezone.is_aware(value):
+                    value = value.astimezone(tz)
+                value = value.isoformat()
+                if value.endswith('+00:00'):
+                    value = value[:-6] + 'Z'
+                item[name] = value
+            else:
+                item[name] = str(value)
+        data.append(item)
+    return data
+
+
+BULK_TEXT_FIELDS = ('name', 'description', 'street_name', 'status', 'type', 'severity')
+
+
+def build_bulk_reports(items):
+    """
+    Validate a list of report dicts in one pass and build unsaved
+    HazardReport objects for the valid ones.
+
+    Mirrors HazardReportSerializer's rules (numeric lat/lon in range, a
+    user_id of an existing user, plain text fields) but checks all user_ids
+    with a single query instead of one per item.
+
+    Returns (reports, errors): reports is a list of (index, HazardReport),
+    errors a list of {'index': i, 'errors': {field: [messages]}}.
+    """
+    candidates = []
+    errors = []
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({'index': index, 'errors': {'non_field_errors': ["Each item must be a JSON object."]}})
+            continue
+
+        item_errors = {}
+        values = {}
+        for field, limit in (('latitude', 90.0), ('longitude', 180.0)):
+            value = item.get(field)
+            if value in (None, ''):
+                item_errors[field] = ["This field is required."]
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                item_errors[field] = ["latitude and longitude must be numeric."]
+                continue
+            if not (-limit <= value <= limit):
+                item_errors[field] = [f"{field} must be between -{limit:g} and {limit:g}."]
+                continue
+            values[field] = value
+
+        if item.get('user_id') in (None, ''):
+            item_errors['user_id'] = ["This field is required."]
+        else:
+            try:
+                values['user_id'] = uuid.UUID(str(item['user_id']))
+            except ValueError:
+                item_errors['user_id'] = ["Must be a valid UUID."]
+
+        for field in BULK_TEXT_FIELDS:
+            value = item.get(field)
+            if value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+                item_errors[field] = ["Not a valid string."]
+                continue
+            values[field] = str(value)
+
+        if item_errors:
+            errors.append({'index': index, 'errors': item_errors})
+        else:
+            candidates.append((index, values))
+
+    user_ids = {values['user_id'] for _, values in candidates}
+    known_users = set(User.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+
+    reports = []
+    now = timezone.now()
+    for index, values in candidates:
+        if values['user_id'] not in known_users:
+            errors.append({'index': index, 'errors': {'user_id': ["User does not exist."]}})
+            continue
+        user_id = values.pop('user_id')
+        reports.append((index, HazardReport(user_id=user_id, created_at=now, **values)))
+
+    errors.sort(key=lambda error: error['index'])
+    return reports, errors
+
+
+MODERATION_STATUSES = ('pending', 'approved', 'rejected')
+
+
+class ModerationFilterSerializer(serializers.Serializer):
+    status = serializers.CharField(required=False)
+    user_id = serializers.UUIDField(required=False)
+    bbox = serializers.CharField(required=False)
+
+    def validate_bbox(self, value):
+        try:
+            return parse_bbox(value)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError("filter must contain at least one of status, user_id, bbox.")
+        return attrs
+
+
+class ModerateReportsSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=False, max_length=10000)
+    filter = ModerationFilterSerializer(required=False)
+    status = serializers.ChoiceField(choices=MODERATION_STATUSES)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('filter' in attrs):
+            raise serializers.ValidationError("Provide either ids or filter.")
         return attrs
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from map.authentication.jwt import PRINCIPAL_CLAIMS, principal_cache
+from map.models.user import User
+
+PRINCIPAL_FIELDS = frozenset(PRINCIPAL_CLAIMS + ('is_active',))
+
+
+@receiver(post_save, sender=User)
+def publish_principal(sender, instance, created, update_fields=None, **kwargs):
+    # Tài khoản mới chưa có token cũ nào cần sửa
+    if created:
+        return
+    if update_fields is not None and not PRINCIPAL_FIELDS.intersection(update_fields):
+        return
+    principal_cache.publish(instance)
+
+
+@receiver(post_delete, sender=User)
+def revoke_principal(sender, instance, **kwargs):
+    principal_cache.revoke(instance.user_id)
@@ -0,0 +1,300 @@
+import base64
+import json
+import os
+import tempfile
+import threading
+import uuid
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from map.management.commands.check_report_serialization import edge_case_reports
+from map.models.hazard_report import HazardReport
+from map.models.hazard_report_code import report_codes
+from map.models.user import User
+from map.renderers.hazard_report import FastJSONRenderer
+from map.serializers.hazard_report import (
+    REPORT_ROW_FIELDS,
+    HazardReportSerializer,
+    report_rows,
+    serialize_report_rows,
+)
+from map.utils.spatial_index import ApprovedReportIndex
+from map.utils.sync_token import encode_sync_token
+
+
+class ReportSerializationParityTests(TestCase):
+    """The fast list path must render the same bytes as HazardReportSerializer."""
+
+    def assertSameBytes(self, reports, rows):
+        for report, row in zip(reports, rows):
+            self.assertEqual(
+                FastJSONRenderer().render(serialize_report_rows([row])[0]),
+                JSONRenderer().render(HazardReportSerializer(report).data),
+                f"report {report.pk}",
+            )
+        self.assertEqual(
+            FastJSONRenderer().render(serialize_report_rows(rows)),
+            JSONRenderer().render(HazardReportSerializer(reports, many=True).data),
+        )
+
+    def test_edge_cases(self):
+        reports = edge_case_reports()
+        rows = [tuple(getattr(report, name) for name in REPORT_ROW_FIELDS) for report in reports]
+        self.assertSameBytes(reports, rows)
+
+    def test_database_rows(self):
+        user = User.objects.create(email='parity@example.com', name='Parity')
+        for report in edge_case_reports():
+            report.user = user
+            # Postgres text cannot hold NUL; the in-memory case covers it
+            report.description = report.description.replace('\x00', '')
+            report.save()
+        # A label saved for the first time gets a new code
+        HazardReport.objects.create(name='new label', type='sinkhole', severity='unusual', latitude=1, longitude=2)
+
+        queryset = HazardReport.objects.defer('search_vector').order_by('-created_at', 'id')
+        self.assertSameBytes(list(queryset), list(report_rows(queryset)))
+
+    def test_command(self):
+        HazardReport.objects.create(name='command', type='flood', severity='low', latitude=1, longitude=2)
+        out = StringIO()
+        call_command('check_report_serialization', stdout=out, stderr=StringIO())
+        self.assertIn('OK', out.getvalue())
+
+
+class BulkActionPermissionTests(TestCase):
+    """The bulk write actions must not inherit the viewset's open permission."""
+
+    def setUp(self):
+        self.report = HazardReport.objects.create(name='queued', status='pending', latitude=1, longitude=2)
+        self.user = User.objects.create(email='member@example.com', name='Member')
+        self.admin = User.objects.create(email='admin@example.com', name='Admin', is_staff=True)
+
+    def moderate(self):
+        return self.client.post(
+            '/api/v1/reports/moderate/',
+            json.dumps({'filter': {'status': 'pending'}, 'status': 'approved'}),
+            content_type='application/json',
+        )
+
+    def test_moderate_requires_admin(self):
+        self.assertEqual(self.moderate().status_code, 401)
+        self.client.force_login(self.user)
+        self.assertEqual(self.moderate().status_code, 403)
+        self.report.refresh_from_db()
+        self.assertEqual(self.report.status, 'pending')
+
+        self.client.force_login(self.admin)
+        self.assertEqual(self.moderate().status_code, 200)
+        self.report.refresh_from_db()
+        self.assertEqual(self.report.status, 'approved')
+
+    def test_bulk_requires_authentication(self):
+        body = json.dumps([{'name': 'bulk', 'latitude': 1, 'longitude': 2, 'user_id': str(self.user.user_id)}])
+        response = self.client.post('/api/v1/reports/bulk/', body, content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+
+        self.client.force_login(self.user)
+        response = self.client.post('/api/v1/reports/bulk/', body, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+
+
+class HazardEventTests(TestCase):
+    """Only approved reports reach the (anonymous) event streams."""
+
+    def setUp(self):
+        self.user = User.objects.create(email='events@example.com', name='Events')
+        self.admin = User.objects.create(email='events-admin@example.com', name='Admin', is_staff=True)
+        patcher = mock.patch('map.utils.hazard_events.hazard_events.publish')
+        self.publish = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def published(self):
+        return [(event['event'], event['report']['id']) for call in self.publish.call_args_list for event in call.args[0]]
+
+    def test_pending_reports_are_not_announced(self):
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/v1/reports/',
+                {'name': 'new', 'latitude': 1, 'longitude': 2, 'user_id': str(self.user.user_id)},
+                content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 201)
+        report_id = response.json()['id']
+        self.assertEqual(self.published(), [])
+
+        self.client.force_login(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                '/api/v1/reports/moderate/', {'ids': [report_id], 'status': 'approved'}, content_type='application/json',
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f'/api/v1/reports/{report_id}/')
+        self.assertEqual(self.published(), [('approved', report_id), ('deleted', report_id)])
+
+    def test_deleting_a_pending_report_is_not_announced(self):
+        report = HazardReport.objects.create(name='queued', latitude=1, longitude=2)
+        self.client.force_login(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/api/v1/reports/{report.pk}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.published(), [])
+
+    def test_wsgi_stream_points_to_asgi(self):
+        self.assertEqual(self.client.get('/api/v1/reports/events/?bbox=0,0,1,1').status_code, 501)
+
+
+class ImportUsersTests(TestCase):
+    """import_users rejects NDJSON lines that are not user objects."""
+
+    def test_non_object_lines_are_skipped(self):
+        lines = ['{"email": "imported@example.com", "name": "Imported"}', '[]', '"x"', '{"email": 5}', '']
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson', delete=False) as handle:
+            handle.write('\n'.join(lines))
+        self.addCleanup(os.remove, handle.name)
+
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_users', handle.name, processes=1, stdout=stdout, stderr=stderr)
+        self.assertIn('Imported 1 of 4 rows', stdout.getvalue())
+        self.assertEqual(stderr.getvalue().count('skipped'), 3)
+        self.assertTrue(User.objects.filter(email='imported@example.com').exists())
+
+
+class LabelOrderingTests(TestCase):
+    """Coded labels sort by name and are looked up once per miss."""
+
+    def setUp(self):
+        self.user = User.objects.create(email='ordering@example.com', name='Ordering', role='User')
+        for label in ('zeta', 'pending', 'approved', 'rejected', 'approved'):
+            HazardReport.objects.create(name=label, latitude=1, longitude=2, status=label, user=self.user)
+
+    def pages(self, ordering):
+        url = f'/api/v1/reports/?user_id={self.user.user_id}&ordering={ordering}&page_size=2'
+        statuses = []
+        while url:
+            data = self.client.get(url).json()
+            statuses += [row['status'] for row in data['results']]
+            url = data['next']
+        return statuses
+
+    def test_status_orders_by_label_across_pages(self):
+        self.assertEqual(self.pages('status'), ['approved', 'approved', 'pending', 'rejected', 'zeta'])
+        self.assertEqual(self.pages('-status'), ['zeta', 'rejected', 'pending', 'approved', 'approved'])
+
+    def test_missing_label_is_cached(self):
+        with self.assertNumQueries(1):
+            self.assertIsNone(report_codes.code('status', 'no-such-status'))
+            self.assertIsNone(report_codes.code('status', 'no-such-status'))
+        with self.settings(HAZARD_CODE_MISS_TTL=0), self.assertNumQueries(2):
+            report_codes.code('status', 'no-such-status-either')
+            report_codes.code('status', 'no-such-status-either')
+        # Saving the label replaces the cached miss
+        HazardReport.objects.create(name='x', latitude=1, longitude=2, status='no-such-status')
+        self.assertIsNotNone(report_codes.code('status', 'no-such-status'))
+
+
+class ApprovedReportIndexTests(TestCase):
+    """The in-process index keeps serving while it rebuilds."""
+
+    def test_rebuild_serves_old_copy_and_replays_writes(self):
+        report = HazardReport.objects.create(name='here', latitude=80.5, longitude=170.5, status='approved')
+        index = ApprovedReportIndex()
+        self.assertEqual(index.nearest(80.5, 170.5, 1, 10)[0][1], report.pk)
+
+        # Built here: the rebuild thread's own connection cannot see the test's rows
+        building, release = threading.Event(), threading.Event()
+        snapshot = index._build()
+
+        def slow_build():
+            building.set()
+            release.wait(10)
+            return snapshot
+
+        index._built_at = 0.0
+        with mock.patch.object(index, '_build', slow_build):
+            rebuild = threading.Thread(target=index.nearest, args=(0, 0, 1, 10))
+            rebuild.start()
+            self.assertTrue(building.wait(10))
+            # Answered from the expired copy without waiting for the build
+            self.assertEqual(index.nearest(80.5, 170.5, 1, 10)[0][1], report.pk)
+            index.discard(report.pk)
+            release.set()
+            rebuild.join(10)
+        # The snapshot has the row, but the discard made meanwhile was replayed
+        self.assertEqual(index.nearest(80.5, 170.5, 1, 10), [])
+
+
+class ReportChangesTests(TestCase):
+    """Delta sync (/reports/changes/) watermarks and tokens."""
+
+    def changes(self, since=None):
+        return self.client.get('/api/v1/reports/changes/', {'since': since} if since else {})
+
+    def sync(self, since=None, at=None):
+        """Follow next_token until has_more is false; returns (changes, deleted, token)."""
+        changes, deleted = [], []
+        with mock.patch('django.utils.timezone.now', return_value=at or timezone.now()):
+            while True:
+                response = self.changes(since)
+                self.assertEqual(response.status_code, 200)
+                data = response.json()
+                changes += data['changes']
+                deleted += data['deleted']
+                since = data['next_token']
+                if not data['has_more']:
+                    return changes, deleted, since
+
+    def test_quiet_table_does_not_expire_token(self):
+        HazardReport.objects.create(name='old', latitude=1, longitude=2)
+        _, _, token = self.sync()
+
+        # A client syncing more often than the retention window, on a table
+        # without deletes, keeps a fresh token
+        step = timedelta(days=settings.HAZARD_SYNC_TOMBSTONE_RETENTION_DAYS * 2 // 3)
+        _, _, token = self.sync(token, at=timezone.now() + step)
+        changes, deleted, _ = self.sync(token, at=timezone.now() + 2 * step)
+        self.assertEqual((changes, deleted), ([], []))
+
+    def test_changes_and_deletes(self):
+        report = HazardReport.objects.create(name='kept', latitude=1, longitude=2)
+        gone = HazardReport.objects.create(name='gone', latitude=1, longitude=2)
+        _, _, token = self.sync()
+        gone_id = str(gone.pk)
+        # The tombstone trigger stamps deleted_at with the database clock
+        gone.delete()
+        report.name = 'renamed'
+        report.save()
+
+        later = timezone.now() + timedelta(seconds=settings.HAZARD_SYNC_SAFETY_LAG + 1)
+        changes, deleted, token = self.sync(token, at=later)
+        self.assertEqual([row['name'] for row in changes], ['renamed'])
+        self.assertEqual(deleted, [gone_id])
+        self.assertEqual(self.sync(token, at=later)[:2], ([], []))
+
+    def test_expired_token_gets_410(self):
+        old = timezone.now() - timedelta(days=settings.HAZARD_SYNC_TOMBSTONE_RETENTION_DAYS + 1)
+        token = encode_sync_token((old, uuid.uuid4()), (old, 0))
+        self.assertEqual(self.changes(token).status_code, 410)
+
+    def test_malformed_tokens_get_400(self):
+        now = timezone.now().isoformat()
+        naive = timezone.now().replace(tzinfo=None).isoformat()
+        payloads = [
+            [[now, 'not-a-uuid'], [now, '0']],
+            [[now, str(uuid.uuid4())], [now, 'x']],
+            [[naive, str(uuid.uuid4())], [now, '0']],
+            [[now, {'id': 1}], None],
+            {'not': 'a list'},
+        ]
+        for payload in payloads:
+            token = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+            self.assertEqual(self.changes(token).status_code, 400, payload)
+        self.assertEqual(self.changes('%%%').status_code, 400)
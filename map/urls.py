@@ -1,9 +1,14 @@
 # map/urls.py
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 from map.views.auth import login, register, logout
-from map.views.hazard_report import HazardReportViewSet
+from map.views.events import ahazard_event_stream, hazard_event_stream
+from map.views.hazard_report import HazardReportViewSet, UserReportList
+from map.views.hazard_report_async import async_report_view
+from map.views.health import db_pool, db_replicas
+from map.views.tiles import hazard_tile
 
 router = DefaultRouter()
 router.register(r'reports', HazardReportViewSet, basename='hazardreport')
@@ -12,5 +17,21 @@ urlpatterns = [
     path('login', login, name='login'),
     path('register', register, name='register'),
     path('logout', logout, name='logout'),
+    path('tiles/<int:z>/<int:x>/<int:y>.mvt', hazard_tile, name='hazard-tile'),
+    path('reports/events/', hazard_event_stream, name='hazard-events'),
+    path('health/db-pool', db_pool, name='db-pool'),
+    path('health/db-replicas', db_replicas, name='db-replicas'),
+    path('users/<uuid:user_id>/reports', UserReportList.as_view(), name='user-reports'),
     path('', include(router.urls)),   # gắn tất cả CRUD endpoint cho HazardReport
 ]
+
+# ASGI mode: the report reads are served by async views (sync viewset as fallback)
+if getattr(settings, 'HAZARD_ASYNC_READS', False):
+    urlpatterns = [
+        path('reports/', async_report_view('list'), name='hazardreport-list-async'),
+        path('reports/pending/', async_report_view('pending_reports'), name='hazardreport-pending-reports-async'),
+        path('reports/approve/', async_report_view('approve_reports'), name='hazardreport-approve-reports-async'),
+        path('reports/export/', async_report_view('export_reports'), name='hazardreport-export-reports-async'),
+        path('reports/<uuid:pk>/', async_report_view('retrieve'), name='hazardreport-detail-async'),
+        path('reports/events/', ahazard_event_stream, name='hazard-events-async'),
+    ] + urlpatterns
@@ -0,0 +1,104 @@
+from map.utils.geo import mercator_xy
+
+SEVERITY_RANK = {'low': 1, 'medium': 2, 'high': 3, 'critical': 4}
+SEVERITY_BY_RANK = {rank: name for name, rank in SEVERITY_RANK.items()}
+
+
+def severity_rank(severity):
+    return SEVERITY_RANK.get((severity or '').strip().lower(), 0)
+
+
+class ClusterIndex:
+    """
+    Multi-resolution grid aggregates for map pins (one level per zoom).
+
+    Each level splits a 256px tile into cells_per_tile x cells_per_tile
+    cells (64px by default) and keeps, per occupied cell:
+    [count, sum_lat, sum_lon, n_rank0, ..., n_rank4]. Adding or removing a
+    point touches one cell per level, so the pyramid is maintained
+    incrementally and a query only reads the cells inside the viewport.
+    """
+
+    def __init__(self, max_zoom=12, cells_per_tile=4):
+        self.max_zoom = max_zoom
+        self.cells_per_tile = cells_per_tile
+        self._levels = [{} for _ in range(max_zoom + 1)]
+
+    def _scale(self, zoom):
+        return (2 ** zoom) * self.cells_per_tile
+
+    def _update(self, lat, lon, severity, sign):
+        x, y = mercator_xy(lat, lon)
+        rank = severity_rank(severity)
+        for zoom, cells in enumerate(self._levels):
+            scale = self._scale(zoom)
+            key = (int(x * scale), int(y * scale))
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = [0, 0.0, 0.0, 0, 0, 0, 0, 0]
+            cell[0] += sign
+            cell[1] += sign * lat
+            cell[2] += sign * lon
+            cell[3 + rank] += sign
+            if cell[0] <= 0:
+                del cells[key]
+
+    def add(self, lat, lon, severity):
+        self._update(lat, lon, severity, 1)
+
+    def remove(self, lat, lon, severity):
+        self._update(lat, lon, severity, -1)
+
+    def _cell_range(self, zoom, min_lon, min_lat, max_lon, max_lat):
+        scale = self._scale(zoom)
+        x_lo, y_lo = mercator_xy(max_lat, min_lon)
+        x_hi, y_hi = mercator_xy(min_lat, max_lon)
+        return int(x_lo * scale), int(y_lo * scale), int(x_hi * scale), int(y_hi * scale), scale
+
+    def clusters(self, zoom, min_lon, min_lat, max_lon, max_lat):
+        """Aggregated cells inside the box at the precomputed level for zoom."""
+        zoom = max(0, min(int(zoom), self.max_zoom))
+        cells = self._levels[zoom]
+        cx_lo, cy_lo, cx_hi, cy_hi, scale = self._cell_range(zoom, min_lon, min_lat, max_lon, max_lat)
+        if min_lon > max_lon:
+            cx_hi += scale
+
+        if (cx_hi - cx_lo + 1) * (cy_hi - cy_lo + 1) > len(cells):
+            for (cx, cy), cell in cells.items():
+                if cy_lo <= cy <= cy_hi and (cx_lo <= cx <= cx_hi or cx + scale <= cx_hi):
+                    yield format_cluster(cell)
+            return
+
+        for cy in range(cy_lo, cy_hi + 1):
+            for cx in range(cx_lo, cx_hi + 1):
+                cell = cells.get((cx % scale, cy))
+                if cell is not None:
+                    yield format_cluster(cell)
+
+
+def aggregate_points(points, zoom, cells_per_tile=4):
+    """Cluster (lat, lon, severity) points on the fly, same layout as ClusterIndex."""
+    scale = (2 ** zoom) * cells_per_tile
+    cells = {}
+    for lat, lon, severity in points:
+        x, y = mercator_xy(lat, lon)
+        key = (int(x * scale), int(y * scale))
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = [0, 0.0, 0.0, 0, 0, 0, 0, 0]
+        cell[0] += 1
+        cell[1] += lat
+        cell[2] += lon
+        cell[3 + severity_rank(severity)] += 1
+    return [format_cluster(cell) for cell in cells.values()]
+
+
+def format_cluster(cell):
+    count = cell[0]
+    worst = next((rank for rank in range(4, 0, -1) if cell[3 + rank] > 0), 0)
+    return {
+        'lat': round(cell[1] / count, 6),
+        'lon': round(cell[2] / count, 6),
+        'count': count,
+        'severity': SEVERITY_BY_RANK.get(worst, ''),
+    }
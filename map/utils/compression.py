@@ -0,0 +1,117 @@
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Per-request compression favours speed; cached entries are compressed once, so they get the best ratio
+GZIP_LEVEL = 6
+GZIP_LEVEL_CACHED = 9
+BROTLI_QUALITY = 5
+BROTLI_QUALITY_CACHED = 9
+
+
+def available_encodings():
+    """Encodings this process can produce, most preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encoding, available=None):
+    """
+    Pick the best of ``available`` allowed by an Accept-Encoding header,
+    honouring q-values (``gzip;q=0`` refuses gzip). Returns None for identity.
+    """
+    if available is None:
+        available = available_encodings()
+    weights = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body, encoding, cached=False):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY_CACHED if cached else BROTLI_QUALITY)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=GZIP_LEVEL_CACHED if cached else GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class _StreamCompressor:
+    """
+    Incremental compressor for streaming bodies.
+
+    Export rows arrive as many tiny chunks; compressing and flushing each one
+    separately would barely shrink them. Input is fed continuously and only
+    flushed to the client every ``flush_size`` raw bytes, so the ratio stays
+    close to one-shot compression while memory stays bounded.
+    """
+
+    def __init__(self, encoding, flush_size):
+        self.encoding = encoding
+        self.flush_size = flush_size
+        self.pending = 0
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        elif encoding == 'gzip':
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def feed(self, chunk):
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        if self.encoding == 'br':
+            out = self._compressor.process(chunk)
+        else:
+            out = self._compressor.compress(chunk)
+        self.pending += len(chunk)
+        if self.pending >= self.flush_size:
+            self.pending = 0
+            if self.encoding == 'br':
+                out += self._compressor.flush()
+            else:
+                out += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return out
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def compress_stream(chunks, encoding, flush_size=32768):
+    compressor = _StreamCompressor(encoding, flush_size)
+    for chunk in chunks:
+        out = compressor.feed(chunk)
+        if out:
+            yield out
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, encoding, flush_size=32768):
+    compressor = _StreamCompressor(encoding, flush_size)
+    async for chunk in chunks:
+        out = compressor.feed(chunk)
+        if out:
+            yield out
+    yield compressor.finish()
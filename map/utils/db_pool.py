@@ -0,0 +1,36 @@
+from django.db import connections
+
+
+def pool_stats(alias='default'):
+    """
+    Counters of this process's connection pool for ``alias``, or None when
+    the alias is not pooled. ``overflow`` is how many connections are open
+    above min_size; wait times cover requests that had to queue for one.
+    """
+    pool = getattr(connections[alias], 'pool', None)
+    if pool is None:
+        return None
+
+    stats = pool.get_stats()
+    size = stats.get('pool_size', 0)
+    available = stats.get('pool_available', 0)
+    queued = stats.get('requests_queued', 0)
+    wait_ms = stats.get('requests_wait_ms', 0)
+    return {
+        'min_size': pool.min_size,
+        'max_size': pool.max_size,
+        'size': size,
+        'in_use': size - available,
+        'idle': available,
+        'overflow': max(0, size - pool.min_size),
+        'waiting': stats.get('requests_waiting', 0),
+        'requests': stats.get('requests_num', 0),
+        'queued': queued,
+        'wait_ms_total': wait_ms,
+        'wait_ms_avg': round(wait_ms / queued, 2) if queued else 0.0,
+        'timeouts': stats.get('requests_errors', 0),
+        'connections_opened': stats.get('connections_num', 0),
+        'connections_lost': stats.get('connections_lost', 0),
+        'connections_ms': stats.get('connections_ms', 0),
+        'bad_returns': stats.get('returns_bad', 0),
+    }
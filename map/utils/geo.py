@@ -0,0 +1,68 @@
+import math
+
+
+def parse_bbox(value):
+    """
+    Parse a ``minLon,minLat,maxLon,maxLat`` string into a tuple of floats.
+
+    minLon > maxLon is allowed and means the box crosses the antimeridian.
+    Raises ValueError with a client-friendly message on bad input.
+    """
+    parts = [part.strip() for part in str(value).split(',')]
+    if len(parts) != 4:
+        raise ValueError("bbox must be minLon,minLat,maxLon,maxLat.")
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in parts)
+    except ValueError:
+        raise ValueError("bbox values must be numeric.")
+
+    if not all(-180.0 <= lon <= 180.0 for lon in (min_lon, max_lon)):
+        raise ValueError("bbox longitudes must be between -180 and 180.")
+    if not all(-90.0 <= lat <= 90.0 for lat in (min_lat, max_lat)):
+        raise ValueError("bbox latitudes must be between -90 and 90.")
+    if min_lat > max_lat:
+        raise ValueError("bbox minLat must not be greater than maxLat.")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE = math.pi * EARTH_RADIUS_M / 180.0
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Great-circle distance in meters."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+MAX_MERCATOR_LAT = 85.05112878
+
+
+def mercator_xy(lat, lon):
+    """Project to Web Mercator, normalized so the world is [0, 1) on both axes."""
+    lat = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, lat))
+    x = (lon + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return min(max(x, 0.0), 1.0 - 1e-12), min(max(y, 0.0), 1.0 - 1e-12)
+
+
+def tile_bounds(z, x, y, buffer=0.0):
+    """
+    (min_lon, min_lat, max_lon, max_lat) of an XYZ tile, optionally grown by
+    ``buffer`` (a fraction of the tile size) on every side.
+    """
+    n = 2 ** z
+
+    def lon_at(col):
+        return max(-180.0, min(180.0, col / n * 360.0 - 180.0))
+
+    def lat_at(row):
+        row = max(0.0, min(float(n), row))
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * row / n))))
+
+    return lon_at(x - buffer), lat_at(y + 1 + buffer), lon_at(x + 1 + buffer), lat_at(y - buffer)
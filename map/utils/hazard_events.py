@@ -0,0 +1,275 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = 'hazard_events'
+# Only reports in this status are visible to anonymous subscribers
+PUBLIC_STATUS = 'approved'
+EVENT_FIELDS = ('id', 'name', 'type', 'severity', 'status', 'latitude', 'longitude')
+# Text fields are cut to this many characters so an event always fits in a
+# NOTIFY payload (Postgres rejects 8000 bytes or more), even fully \u-escaped
+EVENT_TEXT_MAX = 200
+NOTIFY_MAX_BYTES = 7999
+
+
+def report_event(kind, report):
+    """Event for ``report`` (approved or deleted), or None when it has no coordinates."""
+    if report.latitude is None or report.longitude is None:
+        return None
+    data = {field: getattr(report, field) for field in EVENT_FIELDS}
+    for field in ('name', 'type', 'severity', 'status'):
+        data[field] = (data[field] or '')[:EVENT_TEXT_MAX]
+    data['id'] = str(data['id'])
+    data['latitude'] = float(data['latitude'])
+    data['longitude'] = float(data['longitude'])
+    return {'event': kind, 'report': data}
+
+
+class Subscriber:
+    """
+    One open event stream and its viewport. Events are queued up to
+    ``max_queue``; a client that falls further behind is marked
+    ``overflowed`` and its stream ends, so it reloads instead of holding
+    an ever-growing backlog.
+    """
+
+    def __init__(self, bbox, max_queue=256):
+        self.min_lon, self.min_lat, self.max_lon, self.max_lat = bbox
+        self.max_queue = max_queue
+        self.overflowed = False
+        # Grid cells it is registered in; None = too wide to bucket
+        self.cells = ()
+
+    def contains(self, lat, lon):
+        if not (self.min_lat <= lat <= self.max_lat):
+            return False
+        if self.min_lon > self.max_lon:
+            return lon >= self.min_lon or lon <= self.max_lon
+        return self.min_lon <= lon <= self.max_lon
+
+    def deliver(self, event):
+        raise NotImplementedError
+
+
+class AsyncSubscriber(Subscriber):
+    """For async (ASGI) streams; deliver() may be called from any thread."""
+
+    def __init__(self, bbox, max_queue=256):
+        super().__init__(bbox, max_queue)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(max_queue)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def deliver(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # Event loop already closed: the stream is gone
+            self.overflowed = True
+
+    async def get(self, timeout):
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class SubscriptionGrid:
+    """
+    Subscribers bucketed by the lat/lon cells their bbox covers.
+
+    Publishing an event looks at the one cell holding its point (plus the
+    few viewports too large to bucket), so fanout cost follows the number
+    of interested subscribers rather than the number connected.
+    """
+
+    def __init__(self, cell_deg=0.5, max_cells=1024):
+        self.cell_deg = cell_deg
+        self.max_cells = max_cells
+        self.cols = int(round(360.0 / cell_deg))
+        self._cells = {}
+        self._wide = set()
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._count
+
+    def _row(self, lat):
+        return int((lat + 90.0) // self.cell_deg)
+
+    def _col(self, lon):
+        return int((lon + 180.0) // self.cell_deg) % self.cols
+
+    def _cells_for(self, sub):
+        rows = range(self._row(sub.min_lat), self._row(sub.max_lat) + 1)
+        col_lo, col_hi = self._col(sub.min_lon), self._col(sub.max_lon)
+        if sub.min_lon > sub.max_lon or col_hi < col_lo:
+            col_hi += self.cols
+        cols = range(col_lo, col_hi + 1)
+        if len(rows) * len(cols) > self.max_cells:
+            return None
+        return [(row, col % self.cols) for row in rows for col in cols]
+
+    def add(self, sub):
+        cells = self._cells_for(sub)
+        with self._lock:
+            if cells is None:
+                self._wide.add(sub)
+            else:
+                for cell in cells:
+                    self._cells.setdefault(cell, set()).add(sub)
+            sub.cells = cells
+            self._count += 1
+
+    def remove(self, sub):
+        with self._lock:
+            if sub.cells is None:
+                self._wide.discard(sub)
+            else:
+                for cell in sub.cells:
+                    bucket = self._cells.get(cell)
+                    if bucket is not None:
+                        bucket.discard(sub)
+                        if not bucket:
+                            del self._cells[cell]
+            self._count -= 1
+
+    def dispatch(self, event):
+        report = event['report']
+        lat, lon = report['latitude'], report['longitude']
+        with self._lock:
+            candidates = list(self._cells.get((self._row(lat), self._col(lon)), ())) + list(self._wide)
+        for sub in candidates:
+            if sub.contains(lat, lon):
+                sub.deliver(event)
+
+
+class InProcessBroker:
+    """
+    Delivers events to this process's subscribers only. Enough for a
+    single worker (or runserver); with several workers use PostgresBroker.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    def publish(self, events):
+        for event in events:
+            self.grid.dispatch(event)
+
+    def subscribed(self):
+        """Called when a stream opens (PostgresBroker starts its listener here)."""
+
+
+class PostgresBroker(InProcessBroker):
+    """
+    Fans events out to every worker through Postgres LISTEN/NOTIFY.
+
+    publish() runs one pg_notify() per batch on the primary; inside a
+    transaction Postgres delivers it at commit. Each process listens on a
+    dedicated connection from a daemon thread (started with its first
+    subscriber) and dispatches what it hears, its own events included.
+    """
+
+    def __init__(self, grid, alias=None):
+        super().__init__(grid)
+        self.alias = alias
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def publish(self, events):
+        payloads = []
+        for event in events:
+            payload = json.dumps(event, separators=(',', ':'))
+            if len(payload.encode('utf-8')) > NOTIFY_MAX_BYTES:
+                logger.warning("Dropping hazard event too large for NOTIFY: %s", payload[:200])
+                continue
+            payloads.append(payload)
+        if not payloads:
+            return
+        with connections[self.alias or DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute(
+                'SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload',
+                [NOTIFY_CHANNEL, payloads],
+            )
+
+    def subscribed(self):
+        if self._listener is None or not self._listener.is_alive():
+            with self._lock:
+                if self._listener is None or not self._listener.is_alive():
+                    self._listener = threading.Thread(target=self._listen, name='hazard-events', daemon=True)
+                    self._listener.start()
+
+    def _connect(self):
+        import psycopg
+
+        params = connections[self.alias or DEFAULT_DB_ALIAS].settings_dict
+        options = params.get('OPTIONS', {})
+        return psycopg.connect(
+            dbname=params['NAME'], user=params['USER'], password=params['PASSWORD'],
+            host=params['HOST'] or None, port=params['PORT'] or None,
+            sslmode=options.get('sslmode') or None, autocommit=True,
+        )
+
+    def _listen(self):
+        backoff = 1
+        while True:
+            try:
+                with self._connect() as conn:
+                    conn.execute(f'LISTEN {NOTIFY_CHANNEL}')
+                    backoff = 1
+                    for notify in conn.notifies():
+                        try:
+                            self.grid.dispatch(json.loads(notify.payload))
+                        except (ValueError, KeyError):
+                            logger.warning("Ignoring malformed hazard event: %r", notify.payload[:200])
+            except Exception:
+                logger.exception("Hazard event listener lost its connection; retrying in %s s", backoff)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+
+subscriptions = SubscriptionGrid(
+    cell_deg=getattr(settings, 'HAZARD_EVENT_CELL_DEG', 0.5),
+    max_cells=getattr(settings, 'HAZARD_EVENT_MAX_CELLS', 1024),
+)
+hazard_events = import_string(
+    getattr(settings, 'HAZARD_EVENT_BROKER', 'map.utils.hazard_events.InProcessBroker')
+)(subscriptions)
+
+
+def publish_report_events(kind, reports):
+    """
+    Publish ``kind`` events for ``reports`` once the current transaction
+    commits. Streams are anonymous, so only approved reports are announced:
+    the others (pending, rejected) are skipped.
+    """
+    events = [
+        event for event in (report_event(kind, report) for report in reports if report.status == PUBLIC_STATUS)
+        if event is not None
+    ]
+    if events:
+        transaction.on_commit(lambda: _publish(events))
+
+
+def _publish(events):
+    # Runs after commit: the write succeeded, so a broker error must not
+    # turn its response into a 500
+    try:
+        hazard_events.publish(events)
+    except Exception:
+        logger.exception("Could not publish %d hazard events", len(events))
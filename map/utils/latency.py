@@ -0,0 +1,13 @@
+import math
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile of ``values`` (``fraction`` 0.5 = p50, 0.99 =
+    p99). Every benchmark command uses this one definition so their
+    numbers can be compared.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        raise ValueError('percentile() of no values')
+    return ordered[max(0, math.ceil(len(ordered) * fraction) - 1)]
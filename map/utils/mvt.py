@@ -0,0 +1,86 @@
+"""
+Minimal Mapbox Vector Tile (v2) encoder for point layers.
+
+Only what the hazard tiles need: one layer of POINT features with string
+properties. See https://github.com/mapbox/vector-tile-spec/tree/master/2.1
+"""
+
+TILE_EXTENT = 4096
+
+_VARINT = 0
+_LENGTH_DELIMITED = 2
+_POINT = 1
+_MOVE_TO_ONE = (1 & 0x7) | (1 << 3)
+
+
+def _varint(value):
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _zigzag(value):
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+
+def _uint_field(number, value):
+    return _varint((number << 3) | _VARINT) + _varint(value)
+
+
+def _bytes_field(number, payload):
+    return _varint((number << 3) | _LENGTH_DELIMITED) + _varint(len(payload)) + payload
+
+
+def _packed_field(number, values):
+    return _bytes_field(number, b''.join(_varint(value) for value in values))
+
+
+def encode_point_layer(name, features, extent=TILE_EXTENT):
+    """
+    Encode a tile holding a single point layer.
+
+    ``features`` yields (px, py, properties) with px/py in tile units
+    (0..extent, may be slightly outside for buffered points). Properties
+    with a None value are skipped; everything else is sent as a string.
+    Returns b'' when there are no features (a valid empty tile).
+    """
+    keys, key_index = [], {}
+    values, value_index = [], {}
+    encoded = bytearray()
+
+    for px, py, properties in features:
+        tags = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            value = str(value)
+            if key not in key_index:
+                key_index[key] = len(keys)
+                keys.append(key)
+            if value not in value_index:
+                value_index[value] = len(values)
+                values.append(value)
+            tags += (key_index[key], value_index[value])
+
+        feature = (
+            _packed_field(2, tags)
+            + _uint_field(3, _POINT)
+            + _packed_field(4, (_MOVE_TO_ONE, _zigzag(int(px)), _zigzag(int(py))))
+        )
+        encoded += _bytes_field(2, feature)
+
+    if not encoded:
+        return b''
+
+    layer = bytearray(_bytes_field(1, name.encode('utf-8')))
+    layer += encoded
+    for key in keys:
+        layer += _bytes_field(3, key.encode('utf-8'))
+    for value in values:
+        layer += _bytes_field(4, _bytes_field(1, value.encode('utf-8')))
+    layer += _uint_field(5, extent)
+    layer += _uint_field(15, 2)
+    return _bytes_field(3, bytes(layer))
@@ -0,0 +1,185 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from map.models.hazard_report_code import CodedTextField
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on (ordering field, id).
+
+    Each page is a `WHERE (field, id) < (last_field, last_id)` range scan
+    (written as `field <= last_field AND (...)` so the index gets a bound)
+    instead of an OFFSET, so page 1000 costs the same as page 1. The
+    ordering field comes from OrderingFilter (?ordering=), defaulting to
+    relevance when a search filter annotated ``search_rank`` and to
+    -created_at otherwise; id breaks ties so rows with equal values never
+    repeat or go missing between pages. A coded label (status) is sorted
+    and compared by name, through a ``<field>_label`` alias.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    default_ordering = '-created_at'
+    rank_annotation = 'search_rank'
+    label_suffix = '_label'
+    tiebreaker = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self):
+        self.page_size = getattr(settings, 'HAZARD_REPORT_PAGE_SIZE', 50)
+        self.max_page_size = getattr(settings, 'HAZARD_REPORT_MAX_PAGE_SIZE', 500)
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, request, queryset, view):
+        ordering = OrderingFilter().get_ordering(request, queryset, view)
+        if not ordering:
+            ranked = self.rank_annotation in queryset.query.annotations
+            ordering = [f'-{self.rank_annotation}' if ranked else self.default_ordering]
+        field = ordering[0]
+        if field.lstrip('-') == self.tiebreaker:
+            field = self.default_ordering
+        return field.lstrip('-'), field.startswith('-')
+
+    def encode_cursor(self, value, pk, reverse=False):
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        payload = json.dumps([value, str(pk), int(reverse)], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request, model, field):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            value, pk, reverse = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            value = self._to_python(model, field, value)
+            pk = model._meta.get_field(self.tiebreaker).to_python(pk)
+        except (TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk, bool(reverse)
+
+    def _to_python(self, model, field, value):
+        try:
+            return model._meta.get_field(field).to_python(value)
+        except FieldDoesNotExist:
+            # Annotation such as search_rank
+            return float(value)
+
+    def _sort_column(self, queryset, field):
+        """
+        (queryset, column the keyset scans) for the ordering ``field``. Rows
+        and cursors keep the field's value: for a coded field that is the
+        label, which the alias orders and compares by.
+        """
+        try:
+            model_field = queryset.model._meta.get_field(field)
+        except FieldDoesNotExist:
+            return queryset, field
+        if not isinstance(model_field, CodedTextField):
+            return queryset, field
+        column = field + self.label_suffix
+        return queryset.alias(**{column: model_field.label()}), column
+
+    def _page_queryset(self, queryset, request, view):
+        """The (lazy) queryset of one page plus one extra row to detect more."""
+        self.request = request
+        page_size = self.get_page_size(request)
+        self.field, descending = self.get_ordering(request, queryset, view)
+        queryset, column = self._sort_column(queryset, self.field)
+        cursor = self.decode_cursor(request, queryset.model, self.field)
+        self.cursor = cursor
+        reverse = bool(cursor and cursor[2])
+
+        # Đi lùi (previous) = đảo chiều sắp xếp rồi đảo lại kết quả
+        scan_descending = descending != reverse
+        if cursor is not None:
+            value, pk, _ = cursor
+            op = 'lt' if scan_descending else 'gt'
+            # The OR alone is not an index range condition; the inclusive
+            # bound on the field is what the scan starts from
+            queryset = queryset.filter(
+                Q(**{f'{column}__{op}': value})
+                | Q(**{column: value, f'{self.tiebreaker}__{op}': pk}),
+                **{f'{column}__{op}e': value},
+            )
+        prefix = '-' if scan_descending else ''
+        queryset = queryset.order_by(f'{prefix}{column}', f'{prefix}{self.tiebreaker}')
+        return queryset[:page_size + 1], page_size
+
+    def _set_page(self, rows, page_size):
+        reverse = bool(self.cursor and self.cursor[2])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.has_next = True if reverse else has_more
+        self.has_previous = has_more if reverse else self.cursor is not None
+        self.page = rows
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, page_size = self._page_queryset(queryset, request, view)
+        return self._set_page(list(queryset), page_size)
+
+    def page_queryset(self, queryset, request, view=None):
+        """
+        First half of paginate_queryset() for async views: (lazy page
+        queryset, page size). Run it in a sync context, then afetch_page().
+        """
+        return self._page_queryset(queryset, request, view)
+
+    async def afetch_page(self, page_queryset, page_size):
+        """Fetch a page_queryset() result with the async ORM."""
+        return self._set_page([row async for row in page_queryset], page_size)
+
+    def _cursor_link(self, row, reverse):
+        url = self.request.build_absolute_uri()
+        cursor = self.encode_cursor(getattr(row, self.field), getattr(row, self.tiebreaker), reverse)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._cursor_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self._cursor_link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,112 @@
+"""
+Columnar "map pins" encoding for report lists.
+
+A pin is just what the map needs to draw a marker: id, lat/lon and small
+integer codes for type, severity and status. Layout (little endian):
+
+    b'PINS'  u8 version  u32 header_length  header (JSON, space padded)
+    ids        count * 16 bytes  (UUID bytes)
+    latitude   count * float64   (NaN = no coordinate)
+    longitude  count * float64
+    type       count * uint16    (index into header.codes.type)
+    severity   count * uint16
+    status     count * uint16
+
+The header is ``{"count": n, "codes": {"type": [...], ...}, ...extra}``
+and is padded so the columns start on an 8-byte boundary, letting
+browsers wrap them in Float64Array/Uint16Array without copying.
+"""
+import json
+import math
+import struct
+import sys
+import uuid
+from array import array
+
+MAGIC = b'PINS'
+VERSION = 1
+CODE_FIELDS = ('type', 'severity', 'status')
+
+_PREAMBLE = struct.Struct('<4sBI')
+
+
+def _little_endian(column):
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column.tobytes()
+
+
+def encode_pins(rows, **extra):
+    """
+    Encode (id, latitude, longitude, type, severity, status, ...) tuples.
+    Extra header keys (e.g. next/previous links) go in ``extra``.
+    """
+    ids = bytearray()
+    latitudes = array('d')
+    longitudes = array('d')
+    codes = {field: {} for field in CODE_FIELDS}
+    columns = {field: array('H') for field in CODE_FIELDS}
+
+    count = 0
+    for row in rows:
+        report_id, lat, lon = row[0], row[1], row[2]
+        ids += report_id.bytes if isinstance(report_id, uuid.UUID) else uuid.UUID(str(report_id)).bytes
+        latitudes.append(math.nan if lat is None else float(lat))
+        longitudes.append(math.nan if lon is None else float(lon))
+        for offset, field in enumerate(CODE_FIELDS, start=3):
+            table = codes[field]
+            value = row[offset]
+            code = table.get(value)
+            if code is None:
+                code = table[value] = len(table)
+            columns[field].append(code)
+        count += 1
+
+    header = dict(extra, count=count, codes={field: list(codes[field]) for field in CODE_FIELDS})
+    header = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    header += b' ' * (-(_PREAMBLE.size + len(header)) % 8)
+
+    parts = [_PREAMBLE.pack(MAGIC, VERSION, len(header)), header, bytes(ids),
+             _little_endian(latitudes), _little_endian(longitudes)]
+    parts.extend(_little_endian(columns[field]) for field in CODE_FIELDS)
+    return b''.join(parts)
+
+
+def decode_pins(payload):
+    """Inverse of encode_pins(): returns the header dict with a ``results`` list of pin dicts."""
+    magic, version, header_length = _PREAMBLE.unpack_from(payload)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a version %d pins payload." % VERSION)
+    offset = _PREAMBLE.size
+    header = json.loads(payload[offset:offset + header_length])
+    offset += header_length
+    count = header['count']
+
+    ids = [str(uuid.UUID(bytes=bytes(payload[offset + i * 16:offset + (i + 1) * 16]))) for i in range(count)]
+    offset += count * 16
+
+    def column(typecode):
+        nonlocal offset
+        values = array(typecode)
+        size = count * values.itemsize
+        values.frombytes(payload[offset:offset + size])
+        if sys.byteorder != 'little':
+            values.byteswap()
+        offset += size
+        return values
+
+    latitudes, longitudes = column('d'), column('d')
+    coded = {field: column('H') for field in CODE_FIELDS}
+
+    header['results'] = [
+        dict(
+            {
+                'id': ids[i],
+                'latitude': None if math.isnan(latitudes[i]) else latitudes[i],
+                'longitude': None if math.isnan(longitudes[i]) else longitudes[i],
+            },
+            **{field: header['codes'][field][coded[field][i]] for field in CODE_FIELDS},
+        )
+        for i in range(count)
+    ]
+    return header
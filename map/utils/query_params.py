@@ -0,0 +1,22 @@
+from rest_framework.exceptions import ValidationError
+
+
+def get_number(params, name, cast=float, default=None, min_value=None, max_value=None):
+    """
+    Read a numeric query parameter, raising a 400 ValidationError keyed by
+    the parameter name when it is missing, malformed or out of range.
+    """
+    value = params.get(name, None)
+    if value in (None, ''):
+        if default is None:
+            raise ValidationError({name: ["This parameter is required."]})
+        return default
+
+    try:
+        value = cast(value)
+    except (TypeError, ValueError):
+        raise ValidationError({name: ["Must be a number."]})
+
+    if value != value or (min_value is not None and value < min_value) or (max_value is not None and value > max_value):
+        raise ValidationError({name: [f"Must be between {min_value} and {max_value}."]})
+    return value
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count
+
+
+class UserReportCounts:
+    """
+    Cached ``{status: count}`` of each user's reports for "My reports".
+
+    One entry per user, dropped by the viewset write hooks for the users a
+    write touched (and by TTL for writes made outside the API). The count
+    itself is an index-only scan of (user_id, status, created_at).
+    """
+
+    def __init__(self, alias='default', timeout=300):
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _key(self, user_id):
+        return f'hazard_reports:user_counts:{user_id}'
+
+    def get(self, user_id):
+        key = self._key(user_id)
+        counts = self.cache.get(key)
+        if counts is None:
+            from map.models.hazard_report import HazardReport
+
+            rows = (
+                HazardReport.objects.filter(user_id=user_id)
+                .order_by()
+                .values_list('status')
+                .annotate(count=Count('*'))
+            )
+            counts = dict(rows)
+            self.cache.set(key, counts, timeout=self.timeout)
+        return counts
+
+    def invalidate(self, *user_ids):
+        keys = [self._key(user_id) for user_id in set(user_ids) if user_id is not None]
+        if keys:
+            self.cache.delete_many(keys)
+
+
+user_report_counts = UserReportCounts(
+    alias=getattr(settings, 'HAZARD_RESPONSE_CACHE_ALIAS', 'default'),
+    timeout=getattr(settings, 'HAZARD_USER_COUNTS_TTL', 300),
+)
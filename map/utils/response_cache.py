@@ -0,0 +1,160 @@
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+
+from map.utils.compression import available_encodings, choose_encoding, compress
+
+VERSION_KEY = 'hazard_reports:version'
+WRITTEN_KEY = 'hazard_reports:written_at'
+
+
+class ReportResponseCache:
+    """
+    Caches rendered feeds keyed by scope, path, query string, response
+    format and a global report version.
+
+    Every write through HazardReportViewSet calls bump_version(), which
+    orphans all cached feeds at once instead of tracking what each write
+    touched. Entries are stored already rendered and compressed (brotli and
+    gzip) together with a strong ETag, so a hit (or a 304) costs no
+    database, serializer or compression work.
+
+    The backend is the Django cache named by HAZARD_RESPONSE_CACHE_ALIAS:
+    local memory by default (per worker), or a shared cache such as Redis
+    so all gunicorn workers see the same version counter and entries.
+    """
+
+    def __init__(self, alias='default', timeout=300, min_compress_size=1024):
+        self.alias = alias
+        self.timeout = timeout
+        self.min_compress_size = min_compress_size
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def version(self):
+        version = self.cache.get(VERSION_KEY)
+        if version is None:
+            self.cache.add(VERSION_KEY, 1, timeout=None)
+            version = self.cache.get(VERSION_KEY, 1)
+        return version
+
+    def bump_version(self):
+        self.cache.set(WRITTEN_KEY, time.time(), timeout=None)
+        try:
+            return self.cache.incr(VERSION_KEY)
+        except ValueError:
+            self.cache.add(VERSION_KEY, 1, timeout=None)
+            return self.cache.incr(VERSION_KEY)
+
+    def written_within(self, seconds):
+        """Whether a report write bumped the version in the last ``seconds``."""
+        written_at = self.cache.get(WRITTEN_KEY)
+        return written_at is not None and time.time() - written_at < seconds
+
+    def _key(self, scope, request):
+        query = '&'.join(sorted(request.META.get('QUERY_STRING', '').split('&')))
+        raw = f'{scope}|{request.get_host()}|{request.path}|{query}|{request.accepted_media_type}'
+        return f'hazard_reports:resp:{self.version()}:{hashlib.sha1(raw.encode("utf-8")).hexdigest()}'
+
+    def _build_entry(self, body, content_type):
+        entry = {
+            'etag': '"%s"' % hashlib.sha256(body).hexdigest()[:32],
+            'content_type': content_type,
+            'body': body,
+            'encoded': {},
+        }
+        if len(body) >= self.min_compress_size:
+            for encoding in available_encodings():
+                compressed = compress(body, encoding, cached=True)
+                if len(compressed) < len(body):
+                    entry['encoded'][encoding] = compressed
+        return entry
+
+    def _respond(self, request, entry):
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), tuple(entry.get('encoded', ())))
+        # Compressed variants carry the weak form of the ETag, like CompressionMiddleware
+        etag = entry['etag'] if encoding is None else 'W/' + entry['etag']
+
+        etags = [value[2:] if value.startswith('W/') else value
+                 for value in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))]
+        if '*' in etags or entry['etag'] in etags:
+            response = HttpResponseNotModified()
+        elif encoding is not None:
+            response = HttpResponse(entry['encoded'][encoding], content_type=entry['content_type'])
+            response['Content-Encoding'] = encoding
+        else:
+            response = HttpResponse(entry['body'], content_type=entry['content_type'])
+        response['ETag'] = etag
+        response['Cache-Control'] = 'no-cache'
+        response['Vary'] = 'Accept, Accept-Encoding'
+        return response
+
+    def serve(self, request, scope, build):
+        """
+        Return a cached response for this request, calling ``build()`` (a
+        DRF view returning a Response) only on a miss. The browsable API
+        and non-200 responses bypass the cache.
+        """
+        if not self._cacheable(request):
+            return build()
+
+        key = self._key(scope, request)
+        entry = self.cache.get(key)
+        if entry is None:
+            response = build()
+            entry = self._store(key, request, response)
+            if entry is None:
+                return response
+        return self._respond(request, entry)
+
+    async def aserve(self, request, scope, build):
+        """serve() for async views: ``build`` is a coroutine function."""
+        if not self._cacheable(request):
+            return await build()
+
+        key = self._key(scope, request)
+        entry = self.cache.get(key)
+        if entry is None:
+            response = await build()
+            entry = self._store(key, request, response)
+            if entry is None:
+                return response
+        return self._respond(request, entry)
+
+    def _cacheable(self, request):
+        renderer = getattr(request, 'accepted_renderer', None)
+        return request.method == 'GET' and renderer is not None and not isinstance(renderer, BrowsableAPIRenderer)
+
+    def _store(self, key, request, response):
+        if not isinstance(response, Response) or response.status_code != 200:
+            return None
+        renderer = request.accepted_renderer
+        entry = self._build_entry(renderer.render(response.data), renderer.media_type)
+        self.cache.set(key, entry, timeout=self.timeout)
+        return entry
+
+
+report_responses = ReportResponseCache(
+    alias=getattr(settings, 'HAZARD_RESPONSE_CACHE_ALIAS', 'default'),
+    timeout=getattr(settings, 'HAZARD_RESPONSE_CACHE_TTL', 300),
+    min_compress_size=getattr(settings, 'HAZARD_COMPRESS_MIN_SIZE', 1024),
+)
+
+
+def cache_feed(scope):
+    """Serve a viewset action through report_responses."""
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            return report_responses.serve(request, scope, lambda: view_method(self, request, *args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,279 @@
+import heapq
+import math
+import threading
+import time
+
+from django.conf import settings
+
+from map.utils.clustering import ClusterIndex, aggregate_points
+from map.utils.geo import METERS_PER_DEGREE, haversine_m
+
+
+class GridIndex:
+    """
+    Uniform lat/lon bucket grid.
+
+    Points are stored per cell, so a nearest-neighbour query only looks at
+    the handful of cells around the query point instead of every point.
+    Not thread-safe on its own; ApprovedReportIndex guards it with a lock.
+    """
+
+    def __init__(self, cell_deg=0.01):
+        self.cell_deg = cell_deg
+        self.rows = int(math.ceil(180.0 / cell_deg))
+        self.cols = int(math.ceil(360.0 / cell_deg))
+        self._cells = {}
+        self._points = {}
+
+    def __len__(self):
+        return len(self._points)
+
+    def _cell(self, lat, lon):
+        row = min(int((lat + 90.0) // self.cell_deg), self.rows - 1)
+        col = min(int((lon + 180.0) // self.cell_deg), self.cols - 1)
+        return row, col
+
+    def get(self, key):
+        return self._points.get(key)
+
+    def insert(self, key, lat, lon, data=None):
+        """Add or move a point. Returns the previous (lat, lon, data) or None."""
+        previous = self.remove(key)
+        point = (lat, lon, data)
+        self._points[key] = point
+        self._cells.setdefault(self._cell(lat, lon), {})[key] = point
+        return previous
+
+    def remove(self, key):
+        """Drop a point. Returns its (lat, lon, data) or None."""
+        point = self._points.pop(key, None)
+        if point is None:
+            return None
+        cell = self._cell(point[0], point[1])
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self._cells[cell]
+        return point
+
+    def _cells_in(self, min_lon, min_lat, max_lon, max_lat):
+        row_lo, col_lo = self._cell(min_lat, min_lon)
+        row_hi, col_hi = self._cell(max_lat, max_lon)
+        if min_lon > max_lon:
+            col_hi += self.cols
+
+        # Huge boxes (or a sparse grid): walking occupied cells is cheaper
+        if (row_hi - row_lo + 1) * (col_hi - col_lo + 1) > len(self._cells):
+            for (row, col), bucket in self._cells.items():
+                if row_lo <= row <= row_hi and (col_lo <= col <= col_hi or col + self.cols <= col_hi):
+                    yield bucket
+            return
+
+        for row in range(row_lo, row_hi + 1):
+            for col in range(col_lo, col_hi + 1):
+                bucket = self._cells.get((row, col % self.cols))
+                if bucket:
+                    yield bucket
+
+    def within(self, min_lon, min_lat, max_lon, max_lat):
+        """Yield (key, lat, lon, data) for every point inside the box."""
+        crosses = min_lon > max_lon
+        for bucket in self._cells_in(min_lon, min_lat, max_lon, max_lat):
+            for key, (lat, lon, data) in bucket.items():
+                if not (min_lat <= lat <= max_lat):
+                    continue
+                if crosses:
+                    if lon < min_lon and lon > max_lon:
+                        continue
+                elif not (min_lon <= lon <= max_lon):
+                    continue
+                yield key, lat, lon, data
+
+    def nearest(self, lat, lon, k, radius_m):
+        """
+        Return up to k (distance_m, key, data) tuples within radius_m,
+        closest first.
+
+        The search box starts at one cell and doubles until it holds k
+        points or reaches radius_m, so dense areas stay cheap.
+        """
+        search_m = min(radius_m, self.cell_deg * METERS_PER_DEGREE)
+        while True:
+            d_lat = search_m / METERS_PER_DEGREE
+            min_lat = max(-90.0, lat - d_lat)
+            max_lat = min(90.0, lat + d_lat)
+            cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+            if max_lat >= 90.0 or min_lat <= -90.0 or cos_lat <= 0 or d_lat / cos_lat >= 180.0:
+                min_lon, max_lon = -180.0, 180.0
+            else:
+                d_lon = d_lat / cos_lat
+                min_lon = (lon - d_lon + 180.0) % 360.0 - 180.0
+                max_lon = (lon + d_lon + 180.0) % 360.0 - 180.0
+
+            candidates = []
+            for bucket in self._cells_in(min_lon, min_lat, max_lon, max_lat):
+                for key, (p_lat, p_lon, data) in bucket.items():
+                    if not (min_lat <= p_lat <= max_lat):
+                        continue
+                    distance = haversine_m(lat, lon, p_lat, p_lon)
+                    if distance <= search_m:
+                        candidates.append((distance, key, data))
+
+            if len(candidates) >= k or search_m >= radius_m:
+                return heapq.nsmallest(k, candidates, key=lambda item: item[0])
+            search_m = min(radius_m, search_m * 2)
+
+
+class ApprovedReportIndex:
+    """
+    Process-wide indexes of approved reports with coordinates: a GridIndex
+    for point lookups and a ClusterIndex pyramid for map clusters.
+
+    Built lazily from the database and kept current by the viewset write
+    hooks. Other gunicorn workers only see a write after their own copy
+    expires (settings.HAZARD_INDEX_MAX_AGE seconds) and is rebuilt.
+
+    A rebuild reads the database outside ``_lock``: one thread builds while
+    the others keep answering from the old copy, and writes made meanwhile
+    are replayed onto the new one before it is swapped in. Only the very
+    first build makes readers wait.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self._grid = None
+        self._clusters = None
+        self._built_at = 0.0
+        # Writes seen while a rebuild runs, replayed onto the new copy
+        self._pending = None
+        # Bumped by reset() so a rebuild started before it is not installed
+        self._generation = 0
+
+    def _build(self):
+        from map.models.hazard_report import HazardReport
+
+        grid = GridIndex(cell_deg=getattr(settings, 'HAZARD_INDEX_CELL_DEG', 0.01))
+        clusters = ClusterIndex(max_zoom=getattr(settings, 'HAZARD_CLUSTER_MAX_ZOOM', 12))
+        rows = (
+            HazardReport.objects
+            .filter(status='approved', latitude__isnull=False, longitude__isnull=False)
+            .values_list('id', 'latitude', 'longitude', 'type', 'severity')
+            .iterator(chunk_size=5000)
+        )
+        for report_id, lat, lon, report_type, severity in rows:
+            grid.insert(report_id, lat, lon, (report_type, severity))
+            clusters.add(lat, lon, severity)
+        return grid, clusters
+
+    def _fresh(self):
+        max_age = getattr(settings, 'HAZARD_INDEX_MAX_AGE', 300)
+        return self._grid is not None and time.monotonic() - self._built_at <= max_age
+
+    def _current(self):
+        """(grid, clusters) to answer from; rebuilt first when missing or expired."""
+        with self._lock:
+            if self._fresh():
+                return self._grid, self._clusters
+            grid, clusters = self._grid, self._clusters
+        # A stale copy keeps serving while another thread rebuilds
+        if not self._build_lock.acquire(blocking=grid is None):
+            return grid, clusters
+        try:
+            with self._lock:
+                if self._fresh():
+                    return self._grid, self._clusters
+                generation = self._generation
+                self._pending = []
+            try:
+                grid, clusters = self._build()
+            except BaseException:
+                with self._lock:
+                    self._pending = None
+                raise
+            with self._lock:
+                for apply in self._pending:
+                    apply(grid, clusters)
+                self._pending = None
+                if generation == self._generation:
+                    self._grid, self._clusters = grid, clusters
+                    self._built_at = time.monotonic()
+                return grid, clusters
+        finally:
+            self._build_lock.release()
+
+    def _write(self, apply):
+        """Run ``apply(grid, clusters)`` on the live copy and on any rebuild in progress."""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(apply)
+            if self._grid is None:
+                return None
+            return apply(self._grid, self._clusters)
+
+    @staticmethod
+    def _forget(clusters, previous):
+        if previous is not None:
+            lat, lon, (_, severity) = previous
+            clusters.remove(lat, lon, severity)
+
+    def sync(self, report):
+        """Insert, move or drop a report after it was saved. Returns its previous point."""
+        report_id = report.pk
+        if report.status == 'approved' and report.latitude is not None and report.longitude is not None:
+            lat, lon = float(report.latitude), float(report.longitude)
+            data = (report.type, report.severity)
+
+            def apply(grid, clusters):
+                previous = grid.insert(report_id, lat, lon, data)
+                clusters.add(lat, lon, data[1])
+                self._forget(clusters, previous)
+                return previous
+        else:
+            def apply(grid, clusters):
+                previous = grid.remove(report_id)
+                self._forget(clusters, previous)
+                return previous
+        return self._write(apply)
+
+    def discard(self, report_id):
+        def apply(grid, clusters):
+            previous = grid.remove(report_id)
+            self._forget(clusters, previous)
+            return previous
+        return self._write(apply)
+
+    def nearest(self, lat, lon, k, radius_m):
+        grid, _ = self._current()
+        with self._lock:
+            return grid.nearest(lat, lon, k, radius_m)
+
+    def within(self, min_lon, min_lat, max_lon, max_lat):
+        grid, _ = self._current()
+        with self._lock:
+            return list(grid.within(min_lon, min_lat, max_lon, max_lat))
+
+    def clusters(self, zoom, min_lon, min_lat, max_lon, max_lat):
+        """
+        Clusters from the precomputed pyramid; past its deepest level the
+        viewport is small, so its points are grouped on the fly instead.
+        """
+        grid, clusters = self._current()
+        with self._lock:
+            if zoom <= clusters.max_zoom:
+                return list(clusters.clusters(zoom, min_lon, min_lat, max_lon, max_lat))
+            points = [
+                (lat, lon, severity)
+                for _, lat, lon, (_, severity) in grid.within(min_lon, min_lat, max_lon, max_lat)
+            ]
+        return aggregate_points(points, zoom, clusters.cells_per_tile)
+
+    def reset(self):
+        with self._lock:
+            self._grid = None
+            self._clusters = None
+            self._generation += 1
+
+
+approved_reports = ApprovedReportIndex()
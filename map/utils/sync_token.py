@@ -0,0 +1,53 @@
+import base64
+import json
+import uuid
+
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import is_aware
+
+# Tie-breaker of the report mark (HazardReport.id) and the tombstone mark
+# (HazardReportTombstone.id)
+REPORT_KEY = uuid.UUID
+TOMBSTONE_KEY = int
+
+
+def _encode_mark(mark):
+    if mark is None:
+        return None
+    moment, key = mark
+    return [moment.isoformat(), str(key)]
+
+
+def _decode_mark(value, key_type):
+    if value is None:
+        return None
+    moment, key = value
+    if not isinstance(moment, str) or not isinstance(key, str):
+        raise ValueError("bad mark")
+    parsed = parse_datetime(moment)
+    if parsed is None or not is_aware(parsed):
+        raise ValueError("bad timestamp")
+    return parsed, key_type(key)
+
+
+def encode_sync_token(report_mark, tombstone_mark):
+    """
+    Pack the two delta-sync watermarks into an opaque URL-safe token.
+    Each mark is (timestamp, tie-breaker id) of the last row the client saw,
+    or None for "from the beginning".
+    """
+    payload = json.dumps([_encode_mark(report_mark), _encode_mark(tombstone_mark)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_sync_token(token):
+    """
+    Inverse of encode_sync_token(). Raises ValueError on a malformed token,
+    including marks with a naive timestamp or an id of the wrong type.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        report_mark, tombstone_mark = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return _decode_mark(report_mark, REPORT_KEY), _decode_mark(tombstone_mark, TOMBSTONE_KEY)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid sync token.") from exc
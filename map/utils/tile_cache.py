@@ -0,0 +1,128 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from map.utils.geo import mercator_xy
+from map.utils.mvt import TILE_EXTENT
+
+# Points this close to a tile edge (in tile units) are also drawn by the neighbour tile
+TILE_BUFFER = 64
+
+
+def tiles_covering(lat, lon, max_zoom, buffer=TILE_BUFFER):
+    """Yield every (z, x, y) whose buffered extent contains the point."""
+    x, y = mercator_xy(lat, lon)
+    edge = buffer / TILE_EXTENT
+    for z in range(max_zoom + 1):
+        n = 2 ** z
+        fx, fy = x * n, y * n
+        tx, ty = int(fx), int(fy)
+        xs = {tx}
+        ys = {ty}
+        if fx - tx < edge:
+            xs.add((tx - 1) % n)
+        if fx - tx > 1 - edge:
+            xs.add((tx + 1) % n)
+        if fy - ty < edge and ty > 0:
+            ys.add(ty - 1)
+        if fy - ty > 1 - edge and ty < n - 1:
+            ys.add(ty + 1)
+        for col in xs:
+            for row in ys:
+                yield z, col, row
+
+
+class TileCache:
+    """
+    Bounded LRU of encoded tiles, with an optional on-disk second level
+    shared by the workers on one host.
+
+    Entries older than max_age are treated as misses, which bounds how long
+    another worker can serve a tile this worker already invalidated.
+    """
+
+    def __init__(self, max_entries=2048, directory=None, max_age=300, max_zoom=20):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_age = max_age
+        self.max_zoom = max_zoom
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, z, x, y):
+        return os.path.join(self.directory, str(z), str(x), f'{y}.mvt')
+
+    def get(self, z, x, y):
+        key = (z, x, y)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.max_age:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+
+        if not self.directory:
+            return None
+        path = self._path(z, x, y)
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age:
+                return None
+            with open(path, 'rb') as fh:
+                data = fh.read()
+        except OSError:
+            return None
+        self._remember(key, data)
+        return data
+
+    def set(self, z, x, y, data):
+        self._remember((z, x, y), data)
+        if not self.directory:
+            return
+        path = self._path(z, x, y)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def _remember(self, key, data):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, lat, lon):
+        """Drop only the tiles that draw a point at (lat, lon)."""
+        if lat is None or lon is None:
+            return
+        keys = list(tiles_covering(float(lat), float(lon), self.max_zoom))
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+        if self.directory:
+            for key in keys:
+                try:
+                    os.remove(self._path(*key))
+                except OSError:
+                    pass
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+hazard_tiles = TileCache(
+    max_entries=getattr(settings, 'HAZARD_TILE_CACHE_SIZE', 2048),
+    directory=getattr(settings, 'HAZARD_TILE_CACHE_DIR', None),
+    max_age=getattr(settings, 'HAZARD_INDEX_MAX_AGE', 300),
+    max_zoom=getattr(settings, 'HAZARD_TILE_MAX_ZOOM', 20),
+)
@@ -5,11 +5,24 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError
+from map.authentication.jwt import issue_tokens
+from map.authentication.passwords import PasswordHashingBusy, password_hashing
+from map.authentication.revocation import revoked_tokens
 from map.models.user import User
 from map.serializers.auth import LoginSerializer
 from map.utils.handle_response import handle_response
 
 
+def busy_response():
+    response = handle_response(
+        message='Too many login attempts right now, please retry shortly',
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+    response['Retry-After'] = '1'
+    return response
+
+
 # =============================
 # 🚀 LOGIN
 # =============================
@@ -26,16 +39,21 @@ from map.utils.handle_response import handle_response
     ),
     responses={
         200: 'Access and Refresh tokens along with user data',
-        400: 'Invalid credentials'
+        400: 'Invalid credentials',
+        503: 'Password hashing pool is full or timed out, retry later'
     }
 )
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def login(request):
     serializer = LoginSerializer(data=request.data)
-    if serializer.is_valid():
+    try:
+        valid = serializer.is_valid()
+    except PasswordHashingBusy:
+        return busy_response()
+    if valid:
         user = serializer.validated_data
-        refresh = RefreshToken.for_user(user)
+        refresh = issue_tokens(user)
         return handle_response(
             data={
                 'refresh': str(refresh),
@@ -83,6 +101,7 @@ def logout(request):
     try:
         token = RefreshToken(refresh_token)
         token.blacklist()
+        revoked_tokens.revoke(token['jti'], token['exp'])
         return handle_response(message='Logout successful', status_code=status.HTTP_200_OK)
     except Exception as e:
         return handle_response(message=str(e), status_code=status.HTTP_400_BAD_REQUEST)
@@ -103,7 +122,11 @@ def logout(request):
             'name': openapi.Schema(type=openapi.TYPE_STRING, description='Full name'),
         },
     ),
-    responses={201: 'User registered successfully', 400: 'Bad request or email already exists'}
+    responses={
+        201: 'User registered successfully',
+        400: 'Bad request or email already exists',
+        503: 'Password hashing pool is full or timed out, retry later'
+    }
 )
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -118,20 +141,27 @@ def register(request):
             status_code=status.HTTP_400_BAD_REQUEST
         )
 
-    if User.objects.filter(email=email).exists():
+    try:
+        encoded = password_hashing.run(make_password, password)
+    except PasswordHashingBusy:
+        return busy_response()
+
+    # Một câu INSERT duy nhất (autocommit): email trùng, kể cả khi đăng ký đồng thời,
+    # do unique constraint bắt
+    try:
+        user = User.objects.create(
+            email=email,
+            name=name,
+            password=encoded,
+            role='User'
+        )
+    except IntegrityError:
         return handle_response(
             message='Email already registered',
             status_code=status.HTTP_400_BAD_REQUEST
         )
 
-    user = User.objects.create(
-        email=email,
-        name=name,
-        password=make_password(password),
-        role='User'
-    )
-
-    refresh = RefreshToken.for_user(user)
+    refresh = issue_tokens(user)
     return handle_response(
         data={
             'user': {'id': user.user_id, 'email': user.email, 'name': user.name, 'role': user.role},
@@ -0,0 +1,93 @@
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+
+from map.utils.geo import parse_bbox
+from map.utils.hazard_events import AsyncSubscriber, hazard_events, subscriptions
+
+
+def _busy_response():
+    response = JsonResponse({'detail': 'Too many open event streams, retry later'}, status=503)
+    response['Retry-After'] = '5'
+    return response
+
+
+def _format(event, event_id):
+    data = json.dumps(event['report'], separators=(',', ':'))
+    return f"id: {event_id}\nevent: {event['event']}\ndata: {data}\n\n"
+
+
+def _open_stream(request):
+    """
+    Validate the request; returns (subscriber, None) or (None, error
+    response). The stream registers the subscriber once it starts, so a
+    stream that is never iterated cannot leak one.
+    """
+    try:
+        bbox = parse_bbox(request.GET.get('bbox', ''))
+    except ValueError as exc:
+        return None, JsonResponse({'bbox': [str(exc)]}, status=400)
+    if len(subscriptions) >= getattr(settings, 'HAZARD_EVENT_MAX_SUBSCRIBERS', 5000):
+        return None, _busy_response()
+
+    return AsyncSubscriber(bbox, max_queue=getattr(settings, 'HAZARD_EVENT_QUEUE', 256)), None
+
+
+def _stream_response(stream):
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def hazard_event_stream(request):
+    """
+    GET /reports/events/ under WSGI: not served. An open stream would hold
+    a gthread thread for as long as the client stays connected, so event
+    streams are only served by the ASGI server (SERVER_MODE=asgi), see
+    ahazard_event_stream().
+    """
+    return JsonResponse(
+        {'detail': 'Event streams are only served in ASGI mode (SERVER_MODE=asgi).'}, status=501,
+    )
+
+
+async def ahazard_event_stream(request):
+    """
+    GET /reports/events/?bbox=minLon,minLat,maxLon,maxLat (Server-Sent Events)
+
+    Pushes ``approved`` and ``deleted`` events for approved reports inside
+    the viewport (pending reports are never announced), plus a comment line
+    every HAZARD_EVENT_HEARTBEAT seconds. A client that falls too far
+    behind gets a ``reset`` event and the stream ends; it should reload the
+    feed (or /reports/changes/) and reconnect. An open stream costs a queue
+    on the event loop, not a thread.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+    subscriber, error = _open_stream(request)
+    if error is not None:
+        return error
+    heartbeat = getattr(settings, 'HAZARD_EVENT_HEARTBEAT', 15)
+
+    async def stream():
+        await sync_to_async(hazard_events.subscribed)()
+        subscriptions.add(subscriber)
+        event_id = 0
+        try:
+            yield 'retry: 3000\n\n'
+            while not subscriber.overflowed:
+                event = await subscriber.get(timeout=heartbeat)
+                if event is None:
+                    yield f': {int(time.time())}\n\n'
+                    continue
+                event_id += 1
+                yield _format(event, event_id)
+            yield 'event: reset\ndata: {}\n\n'
+        finally:
+            subscriptions.remove(subscriber)
+
+    return _stream_response(stream())
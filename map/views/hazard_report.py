@@ -1,12 +1,69 @@
-from rest_framework import viewsets, permissions, filters, status
+from rest_framework import generics, viewsets, permissions, filters, status
 from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from django.utils.functional import cached_property
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BrowsableAPIRenderer
 
+from map.db_router import replicas
+from map.filters.hazard_report import BoundingBoxFilter, FullTextSearchFilter, filter_by_bbox
 from map.models.hazard_report import HazardReport
-from map.serializers.hazard_report import HazardReportSerializer
+from map.models.hazard_report_tombstone import HazardReportTombstone
+from map.parsers.hazard_report import NDJSONParser
+from map.renderers.hazard_report import (
+    CSVRenderer,
+    FastJSONRenderer,
+    GeoJSONRenderer,
+    NDJSONRenderer,
+    PinsRenderer,
+)
+from map.serializers.hazard_report import (
+    HazardReportSerializer,
+    ModerateReportsSerializer,
+    build_bulk_reports,
+    pin_rows,
+    report_rows,
+    serialize_report_rows,
+)
+from map.utils.geo import parse_bbox
+from map.utils.hazard_events import publish_report_events
+from map.utils.pagination import KeysetPagination
+from map.utils.query_params import get_number
+from map.utils.report_counts import user_report_counts
+from map.utils.response_cache import cache_feed, report_responses
+from map.utils.spatial_index import approved_reports
+from map.utils.sync_token import decode_sync_token, encode_sync_token
+from map.utils.tile_cache import hazard_tiles
+PAGINATION_PARAMETERS = [
+    openapi.Parameter(
+        'cursor', openapi.IN_QUERY,
+        description='Opaque cursor taken from the previous response (next/previous)',
+        type=openapi.TYPE_STRING
+    ),
+    openapi.Parameter(
+        'page_size', openapi.IN_QUERY,
+        description='Items per page (default 50, max 500)',
+        type=openapi.TYPE_INTEGER
+    ),
+    openapi.Parameter(
+        'format', openapi.IN_QUERY,
+        description='json (default) or pins: compact binary id/lat/lon/type/severity/status columns '
+                    '(same as Accept: application/vnd.safemap.pins)',
+        type=openapi.TYPE_STRING
+    ),
+]
+
+
 class ReadAnyCreateAuthUpdateDeleteAdmin(permissions.BasePermission):
     """
     SAFE methods (GET, HEAD, OPTIONS): AllowAny
@@ -17,7 +74,71 @@ class ReadAnyCreateAuthUpdateDeleteAdmin(permissions.BasePermission):
         return True
 
 
-class HazardReportViewSet(viewsets.ModelViewSet):
+class FastReportListMixin:
+    """Report lists served from values_list() rows instead of model instances."""
+
+    def _fast_paginated_response(self, queryset):
+        """
+        Keyset page of report_rows() tuples (plus the ordering column the
+        cursor needs), serialized with serialize_report_rows(). The pins
+        format only selects pin_rows() and lets PinsRenderer pack them.
+        """
+        pins, rows = self._fast_rows(queryset)
+        page = self.paginate_queryset(rows)
+        return self.get_paginated_response(page if pins else serialize_report_rows(page))
+
+    def _fast_page(self, queryset):
+        """
+        Sync half of _afast_paginated_response(): the lazy queryset of one
+        page. Filtering on a label can look up its code in the database, so
+        the async views build this in their sync_to_async hop.
+        """
+        pins, rows = self._fast_rows(queryset)
+        page_queryset, page_size = self.paginator.page_queryset(rows, self.request, view=self)
+        return pins, page_queryset, page_size
+
+    async def _afast_paginated_response(self, page):
+        """_fast_paginated_response() for the async read views, given _fast_page()."""
+        pins, page_queryset, page_size = page
+        rows = await self.paginator.afetch_page(page_queryset, page_size)
+        return self.get_paginated_response(rows if pins else serialize_report_rows(rows))
+
+    def _fast_rows(self, queryset):
+        field, _ = self.paginator.get_ordering(self.request, queryset, self)
+        if isinstance(self.request.accepted_renderer, PinsRenderer):
+            return True, pin_rows(queryset, extra=(field,))
+        return False, report_rows(queryset, extra=(field,))
+
+
+class ReplicaReadMixin:
+    """
+    Runs the querysets of ``replica_read_actions`` on a healthy replica.
+
+    Requests pinned by PrimaryPinMiddleware (the client wrote recently)
+    stay on the primary. So do ``cached_read_actions`` for a short while
+    after any report write: a lagging replica must not seed the feed cache
+    under the new version with the old rows.
+    """
+    replica_read_actions = ()
+    cached_read_actions = ()
+
+    @cached_property
+    def read_alias(self):
+        if getattr(self.request, 'read_primary', False):
+            return None
+        pin = getattr(settings, 'HAZARD_PRIMARY_PIN_SECONDS', 5)
+        if self.action in self.cached_read_actions and report_responses.written_within(pin):
+            return None
+        return replicas.choose()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in self.replica_read_actions and self.read_alias:
+            queryset = queryset.using(self.read_alias)
+        return queryset
+
+
+class HazardReportViewSet(ReplicaReadMixin, FastReportListMixin, viewsets.ModelViewSet):
     """
     CRUD for HazardReport:
     - list (GET /hazard-reports/)
@@ -26,15 +147,26 @@ class HazardReportViewSet(viewsets.ModelViewSet):
     - update/partial_update (PUT/PATCH /hazard-reports/{id}/)
     - destroy (DELETE /hazard-reports/{id}/)
     """
-    queryset = HazardReport.objects.all().order_by('-created_at')
+    queryset = HazardReport.objects.defer('search_vector').order_by('-created_at')
     serializer_class = HazardReportSerializer
     permission_classes = [ReadAnyCreateAuthUpdateDeleteAdmin]
+    pagination_class = KeysetPagination
 
     # Enable search & ordering
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['name', 'street_name', 'description', 'type', 'status', 'severity']
+    filter_backends = [FullTextSearchFilter, filters.OrderingFilter, BoundingBoxFilter]
     ordering_fields = ['created_at', 'updated_at', 'street_name', 'status']
 
+    # Read-only list endpoints serialize values_list() tuples, not model instances
+    fast_read_actions = ('list', 'pending_reports', 'approve_reports')
+    # Served from a read replica when one is healthy (see ReplicaReadMixin)
+    replica_read_actions = ('list', 'retrieve', 'pending_reports', 'approve_reports', 'export_reports')
+    cached_read_actions = ('pending_reports', 'approve_reports')
+
+    def get_renderers(self):
+        if self.action in self.fast_read_actions:
+            return [FastJSONRenderer(), PinsRenderer(), BrowsableAPIRenderer()]
+        return super().get_renderers()
+
     # ------------------------
     # Swagger Documentation
     # ------------------------
@@ -46,9 +178,15 @@ class HazardReportViewSet(viewsets.ModelViewSet):
                 description='Filter reports by user_id (UUID)',
                 type=openapi.TYPE_STRING
             ),
+            openapi.Parameter(
+                'status', openapi.IN_QUERY,
+                description='Filter reports by status (pending, approved, ...)',
+                type=openapi.TYPE_STRING
+            ),
             openapi.Parameter(
                 'search', openapi.IN_QUERY,
-                description='Search by name, street_name, description, type, or status',
+                description='Full-text search on name, street_name, description, type, status, severity '
+                            '(ranked by relevance unless ordering is given)',
                 type=openapi.TYPE_STRING
             ),
             openapi.Parameter(
@@ -56,19 +194,30 @@ class HazardReportViewSet(viewsets.ModelViewSet):
                 description='Order by created_at, updated_at, street_name, or status',
                 type=openapi.TYPE_STRING
             ),
-        ]
+            openapi.Parameter(
+                'bbox', openapi.IN_QUERY,
+                description='Only reports inside the viewport: minLon,minLat,maxLon,maxLat',
+                type=openapi.TYPE_STRING
+            ),
+        ] + PAGINATION_PARAMETERS
     )
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
+        queryset = self._filter_by_params(self.filter_queryset(self.get_queryset()))
+        return self._fast_paginated_response(queryset)
+    
+    def _filter_by_params(self, queryset):
+        params = self.request.query_params
 
-        # 👉 Lọc theo user_id nếu có
-        user_id = request.query_params.get('user_id', None)
+        # 👉 Lọc theo user_id / status nếu có
+        user_id = params.get('user_id', None)
         if user_id:
-            queryset = queryset.filter(user__user_id=user_id)
+            queryset = queryset.filter(user_id=user_id)
+
+        report_status = params.get('status', None)
+        if report_status:
+            queryset = queryset.filter(status=report_status)
+        return queryset
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
-    
     @swagger_auto_schema(
         operation_summary="List all pending hazard reports",
         manual_parameters=[
@@ -77,32 +226,220 @@ class HazardReportViewSet(viewsets.ModelViewSet):
                 description='Optionally filter pending reports by user_id (UUID)',
                 type=openapi.TYPE_STRING
             ),
-        ],
+        ] + PAGINATION_PARAMETERS,
         responses={200: HazardReportSerializer(many=True)},
     )
     @action(detail=False, methods=['get'], url_path='pending')
+    @cache_feed('pending')
     def pending_reports(self, request):
         """
         Trả về tất cả report có status='pending', có thể lọc thêm theo user_id
         """
         user_id = request.query_params.get('user_id', None)
-        queryset = HazardReport.objects.filter(status='pending')
+        queryset = self.get_queryset().filter(status='pending')
 
         if user_id:
-            queryset = queryset.filter(user__user_id=user_id)
+            queryset = queryset.filter(user_id=user_id)
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return self._fast_paginated_response(queryset)
     
     @swagger_auto_schema(
         operation_summary="List all approve hazard reports",
+        manual_parameters=PAGINATION_PARAMETERS,
         responses={200: HazardReportSerializer(many=True)},
     )
     @action(detail=False, methods=['get'], url_path='approve')
+    @cache_feed('approved')
     def approve_reports(self, request):
-        queryset = HazardReport.objects.filter(status='approved')
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        queryset = self.get_queryset().filter(status='approved')
+        return self._fast_paginated_response(queryset)
+
+    @swagger_auto_schema(
+        operation_summary="Export hazard reports as a stream (ndjson, geojson or csv)",
+        manual_parameters=[
+            openapi.Parameter(
+                'format', openapi.IN_QUERY,
+                description='ndjson (default), geojson or csv',
+                type=openapi.TYPE_STRING
+            ),
+            openapi.Parameter('status', openapi.IN_QUERY, description='Filter by status', type=openapi.TYPE_STRING),
+            openapi.Parameter('user_id', openapi.IN_QUERY, description='Filter by user_id (UUID)', type=openapi.TYPE_STRING),
+            openapi.Parameter('search', openapi.IN_QUERY, description='Same as list', type=openapi.TYPE_STRING),
+            openapi.Parameter('bbox', openapi.IN_QUERY, description='minLon,minLat,maxLon,maxLat', type=openapi.TYPE_STRING),
+        ],
+    )
+    @action(
+        detail=False, methods=['get'], url_path='export',
+        renderer_classes=[NDJSONRenderer, GeoJSONRenderer, CSVRenderer],
+    )
+    def export_reports(self, request):
+        """
+        Stream từng dòng qua server-side cursor (QuerySet.iterator), không giữ cả
+        kết quả trong bộ nhớ.
+        """
+        return self._export_response(self._export_stream())
+
+    def _export_stream(self):
+        """Lazy iterator of rendered export chunks; no query runs until it is iterated."""
+        queryset = self._filter_by_params(self.filter_queryset(self.get_queryset()))
+        serializer = self.get_serializer()
+        fields = [name for name, field in serializer.fields.items() if not field.write_only]
+
+        chunk_size = getattr(settings, 'HAZARD_EXPORT_CHUNK_SIZE', 2000)
+        rows = (serializer.to_representation(report) for report in queryset.iterator(chunk_size=chunk_size))
+        return self.request.accepted_renderer.stream(rows, fields)
+
+    def _export_response(self, content):
+        renderer = self.request.accepted_renderer
+        response = StreamingHttpResponse(content, content_type=renderer.media_type)
+        response['Content-Disposition'] = f'attachment; filename="hazard_reports.{renderer.extension}"'
+        return response
+
+    @swagger_auto_schema(
+        operation_summary="Reports changed or deleted since a sync token (offline clients)",
+        manual_parameters=[
+            openapi.Parameter(
+                'since', openapi.IN_QUERY,
+                description='next_token from the previous call; omit for a full sync',
+                type=openapi.TYPE_STRING
+            ),
+        ],
+        responses={
+            200: 'changes, deleted ids, has_more and next_token',
+            410: 'since is older than the tombstone retention; do a full sync',
+        },
+    )
+    @action(detail=False, methods=['get'], url_path='changes')
+    def report_changes(self, request):
+        """
+        Delta sync: report được tạo/sửa sau watermark (updated_at, id) và id các
+        report đã xoá (tombstone). Gọi lại với next_token cho tới khi has_more=false.
+
+        Rows newer than HAZARD_SYNC_SAFETY_LAG seconds are held back until the
+        next call, so transactions still committing are not skipped. A token
+        older than the tombstone retention gets 410: the client must resync.
+        """
+        upper = timezone.now() - timedelta(seconds=getattr(settings, 'HAZARD_SYNC_SAFETY_LAG', 2))
+        limit = getattr(settings, 'HAZARD_SYNC_PAGE_SIZE', 1000)
+
+        since = request.query_params.get('since')
+        if since:
+            try:
+                report_mark, tombstone_mark = decode_sync_token(since)
+            except ValueError as exc:
+                raise ValidationError({'since': [str(exc)]})
+        else:
+            # Full sync: the client has nothing yet, so older deletes do not matter
+            report_mark, tombstone_mark = None, (upper, 0)
+
+        retention = getattr(settings, 'HAZARD_SYNC_TOMBSTONE_RETENTION_DAYS', 30)
+        if tombstone_mark is not None and tombstone_mark[0] < timezone.now() - timedelta(days=retention):
+            # Deletes older than the retention window may already be pruned
+            return Response(
+                {'detail': 'Sync token expired; start a full sync without since.'},
+                status=status.HTTP_410_GONE,
+            )
+
+        reports = self.get_queryset().filter(updated_at__lt=upper)
+        if report_mark is not None:
+            # The __gte bound is the index range; the OR only trims ties at the mark
+            reports = reports.filter(
+                Q(updated_at__gt=report_mark[0]) | Q(updated_at=report_mark[0], id__gt=report_mark[1]),
+                updated_at__gte=report_mark[0],
+            )
+        reports = list(reports.order_by('updated_at', 'id')[:limit + 1])
+
+        tombstones = HazardReportTombstone.objects.filter(deleted_at__lt=upper)
+        if tombstone_mark is not None:
+            tombstones = tombstones.filter(
+                Q(deleted_at__gt=tombstone_mark[0]) | Q(deleted_at=tombstone_mark[0], id__gt=tombstone_mark[1]),
+                deleted_at__gte=tombstone_mark[0],
+            )
+        tombstones = list(tombstones.order_by('deleted_at', 'id').values_list('id', 'report_id', 'deleted_at')[:limit + 1])
+
+        reports_more, tombstones_more = len(reports) > limit, len(tombstones) > limit
+        reports, tombstones = reports[:limit], tombstones[:limit]
+        # A drained stream is caught up to upper even when nothing changed, so
+        # a client of a quiet table does not age past the tombstone retention
+        if reports_more:
+            report_mark = (reports[-1].updated_at, reports[-1].pk)
+        else:
+            report_mark = (upper, uuid.UUID(int=0))
+        if tombstones_more:
+            tombstone_mark = (tombstones[-1][2], tombstones[-1][0])
+        else:
+            tombstone_mark = (upper, 0)
+        has_more = reports_more or tombstones_more
+
+        return Response({
+            'changes': self.get_serializer(reports, many=True).data,
+            'deleted': [report_id for _, report_id, _ in tombstones],
+            'has_more': has_more,
+            'next_token': encode_sync_token(report_mark, tombstone_mark),
+        }, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_summary="k nearest approved hazard reports, closest first",
+        manual_parameters=[
+            openapi.Parameter('lat', openapi.IN_QUERY, description='Latitude', type=openapi.TYPE_NUMBER, required=True),
+            openapi.Parameter('lon', openapi.IN_QUERY, description='Longitude', type=openapi.TYPE_NUMBER, required=True),
+            openapi.Parameter('k', openapi.IN_QUERY, description='Max results (default 10, max 100)', type=openapi.TYPE_INTEGER),
+            openapi.Parameter(
+                'radius_m', openapi.IN_QUERY,
+                description='Search radius in meters (default 5000, max 50000)',
+                type=openapi.TYPE_NUMBER
+            ),
+        ],
+    )
+    @action(detail=False, methods=['get'], url_path='nearest')
+    def nearest_reports(self, request):
+        """
+        Tra cứu trên spatial index trong bộ nhớ, chỉ query DB theo id của k kết quả.
+        Mỗi item có thêm distance_m.
+        """
+        params = request.query_params
+        lat = get_number(params, 'lat', min_value=-90.0, max_value=90.0)
+        lon = get_number(params, 'lon', min_value=-180.0, max_value=180.0)
+        k = get_number(params, 'k', cast=int, default=10, min_value=1, max_value=100)
+        radius_m = get_number(params, 'radius_m', default=5000.0, min_value=1.0, max_value=50000.0)
+
+        hits = approved_reports.nearest(lat, lon, k, radius_m)
+        # The index of another worker can lag a moderation; only approved rows are served
+        reports = HazardReport.objects.filter(status='approved').in_bulk([report_id for _, report_id, _ in hits])
+
+        data = []
+        for distance, report_id, _ in hits:
+            report = reports.get(report_id)
+            if report is None:
+                continue
+            item = self.get_serializer(report).data
+            item['distance_m'] = round(distance, 1)
+            data.append(item)
+        return Response(data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_summary="Clustered approved hazard reports for a map viewport",
+        manual_parameters=[
+            openapi.Parameter(
+                'bbox', openapi.IN_QUERY,
+                description='Viewport: minLon,minLat,maxLon,maxLat',
+                type=openapi.TYPE_STRING, required=True
+            ),
+            openapi.Parameter('zoom', openapi.IN_QUERY, description='Map zoom level (0-22)', type=openapi.TYPE_INTEGER, required=True),
+        ],
+    )
+    @action(detail=False, methods=['get'], url_path='clusters')
+    def cluster_reports(self, request):
+        """
+        Trả về các cụm (lat/lon trung bình, count, severity cao nhất) trong viewport.
+        """
+        try:
+            bbox = parse_bbox(request.query_params.get('bbox', ''))
+        except ValueError as exc:
+            raise ValidationError({'bbox': [str(exc)]})
+        zoom = get_number(request.query_params, 'zoom', cast=int, min_value=0, max_value=22)
+
+        return Response(approved_reports.clusters(zoom, *bbox), status=status.HTTP_200_OK)
 
     @swagger_auto_schema(operation_summary="Retrieve a hazard report by ID")
     def retrieve(self, request, *args, **kwargs):
@@ -119,8 +456,96 @@ class HazardReportViewSet(viewsets.ModelViewSet):
 
         # Ghi thêm thời gian tạo
         serializer.save(created_at=timezone.now())
+        # Announced only when created already approved (see publish_report_events)
+        self._on_report_saved(serializer.instance, event='approved')
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
+    @swagger_auto_schema(
+        operation_summary="Create many hazard reports at once (JSON array or NDJSON)",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(type=openapi.TYPE_OBJECT, description='Same fields as create'),
+        ),
+        responses={
+            201: 'created count, ids and per-item errors',
+            400: 'Nothing valid to create, or too many items',
+            401: 'Not authenticated',
+        }
+    )
+    @action(
+        detail=False, methods=['post'], url_path='bulk', parser_classes=[JSONParser, NDJSONParser],
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    def bulk_create_reports(self, request):
+        """
+        Validate cả lô một lượt (1 query kiểm tra user_id), insert bằng bulk_create
+        theo batch. Item lỗi được trả về kèm index, không làm hỏng cả lô.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({'non_field_errors': ["Expected a JSON array or NDJSON body."]})
+        max_items = getattr(settings, 'HAZARD_BULK_MAX_ITEMS', 5000)
+        if len(items) > max_items:
+            raise ValidationError({'non_field_errors': [f"At most {max_items} reports per request."]})
+
+        reports, errors = build_bulk_reports(items)
+        created = [report for _, report in reports]
+        if created:
+            HazardReport.objects.bulk_create(created, batch_size=getattr(settings, 'HAZARD_BULK_BATCH_SIZE', 1000))
+            self._on_reports_saved(created, event='approved')
+
+        return Response(
+            {
+                'created': len(created),
+                'ids': [report.pk for report in created],
+                'errors': errors,
+            },
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Approve/reject many hazard reports in one UPDATE (Admin only)",
+        request_body=ModerateReportsSerializer,
+        responses={200: 'updated count and ids', 400: 'Invalid request', 401: 'Not authenticated', 403: 'Not an admin'}
+    )
+    @action(detail=False, methods=['post'], url_path='moderate', permission_classes=[permissions.IsAdminUser])
+    def moderate_reports(self, request):
+        """
+        Body: {"ids": [...], "status": "approved"} hoặc
+              {"filter": {"status": "pending", "user_id": ..., "bbox": ...}, "status": "rejected"}
+        Chạy đúng một câu UPDATE ... RETURNING, không load từng report.
+        """
+        serializer = ModerateReportsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        target = serializer.validated_data['status']
+
+        if 'ids' in serializer.validated_data:
+            rows = HazardReport.objects.set_status_by_ids(serializer.validated_data['ids'], target)
+        else:
+            criteria = serializer.validated_data['filter']
+            queryset = HazardReport.objects.all()
+            if 'status' in criteria:
+                queryset = queryset.filter(status=criteria['status'])
+            if 'user_id' in criteria:
+                queryset = queryset.filter(user_id=criteria['user_id'])
+            if 'bbox' in criteria:
+                queryset = filter_by_bbox(queryset, criteria['bbox'])
+            rows = queryset.set_status(target)
+
+        reports = [
+            HazardReport(
+                id=report_id, user_id=user_id, name=name, status=target, latitude=lat, longitude=lon,
+                type=report_type, severity=severity,
+            )
+            for report_id, user_id, name, lat, lon, report_type, severity in rows
+        ]
+        if reports:
+            self._on_reports_saved(reports, event='approved' if target == 'approved' else None)
+        return Response(
+            {'updated': len(reports), 'ids': [report.pk for report in reports]},
+            status=status.HTTP_200_OK,
+        )
+
     @swagger_auto_schema(
         operation_summary="Update a hazard report (Admin only)",
         request_body=HazardReportSerializer
@@ -138,3 +563,86 @@ class HazardReportViewSet(viewsets.ModelViewSet):
     @swagger_auto_schema(operation_summary="Delete a hazard report (Admin only)")
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        previous = (serializer.instance.latitude, serializer.instance.longitude)
+        previous_user_id = serializer.instance.user_id
+        was_approved = serializer.instance.status == 'approved'
+        super().perform_update(serializer)
+        approved = not was_approved and serializer.instance.status == 'approved'
+        self._on_report_saved(serializer.instance, previous, previous_user_id, event='approved' if approved else None)
+
+    def perform_destroy(self, instance):
+        report_id = instance.pk
+        super().perform_destroy(instance)
+        self._on_report_deleted(report_id, instance)
+
+    # ------------------------
+    # Write hooks: keep in-process indexes, tile cache and feed cache in sync,
+    # and push ``event`` to the viewport subscribers
+    # ------------------------
+    def _on_report_saved(self, report, previous=None, previous_user_id=None, event=None):
+        if event is not None:
+            publish_report_events(event, [report])
+        report_responses.bump_version()
+        user_report_counts.invalidate(report.user_id, previous_user_id)
+        approved_reports.sync(report)
+        hazard_tiles.invalidate(report.latitude, report.longitude)
+        if previous is not None:
+            hazard_tiles.invalidate(*previous)
+
+    def _on_reports_saved(self, reports, event=None):
+        if event is not None:
+            publish_report_events(event, reports)
+        report_responses.bump_version()
+        user_report_counts.invalidate(*(report.user_id for report in reports))
+        for report in reports:
+            approved_reports.sync(report)
+            hazard_tiles.invalidate(report.latitude, report.longitude)
+
+    def _on_report_deleted(self, report_id, report):
+        # delete() cleared the instance's pk
+        report.pk = report_id
+        publish_report_events('deleted', [report])
+        report_responses.bump_version()
+        user_report_counts.invalidate(report.user_id)
+        approved_reports.discard(report_id)
+        hazard_tiles.invalidate(report.latitude, report.longitude)
+
+
+class UserReportList(FastReportListMixin, generics.GenericAPIView):
+    """
+    GET /users/{user_id}/reports: one user's reports, newest first, with
+    their cached count per status.
+
+    Filters hazard_report.user_id directly (the FK column already holds
+    the user's UUID), so there is no join through User and an unknown user
+    simply has no reports. Served by the (user_id, status, created_at)
+    index.
+    """
+    queryset = HazardReport.objects.defer('search_vector')
+    permission_classes = [ReadAnyCreateAuthUpdateDeleteAdmin]
+    pagination_class = KeysetPagination
+    renderer_classes = [FastJSONRenderer, PinsRenderer, BrowsableAPIRenderer]
+    ordering_fields = ['created_at', 'updated_at']
+
+    @swagger_auto_schema(
+        operation_summary="A user's hazard reports (My reports) with counts per status",
+        manual_parameters=[
+            openapi.Parameter(
+                'status', openapi.IN_QUERY,
+                description='Only reports in this status (pending, approved, ...)',
+                type=openapi.TYPE_STRING
+            ),
+        ] + PAGINATION_PARAMETERS,
+        responses={200: 'next, previous, results and counts ({status: n})'},
+    )
+    def get(self, request, user_id):
+        queryset = self.get_queryset().filter(user_id=user_id)
+        report_status = request.query_params.get('status')
+        if report_status:
+            queryset = queryset.filter(status=report_status)
+
+        response = self._fast_paginated_response(queryset)
+        response.data['counts'] = user_report_counts.get(user_id)
+        return response
@@ -0,0 +1,177 @@
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, HttpResponseBase
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+
+from map.utils.response_cache import report_responses
+from map.views.hazard_report import HazardReportViewSet
+
+# Same method maps DefaultRouter gives the viewset; used for everything the
+# async path does not handle itself (writes, errors, the browsable API)
+SYNC_VIEWS = {
+    'list': HazardReportViewSet.as_view({'get': 'list', 'post': 'create'}),
+    'retrieve': HazardReportViewSet.as_view({
+        'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy',
+    }),
+    'pending_reports': HazardReportViewSet.as_view({'get': 'pending_reports'}),
+    'approve_reports': HazardReportViewSet.as_view({'get': 'approve_reports'}),
+    'export_reports': HazardReportViewSet.as_view(
+        {'get': 'export_reports'}, **HazardReportViewSet.export_reports.kwargs,
+    ),
+}
+
+
+class Fallback(Exception):
+    """Let the sync DRF view answer this request."""
+
+
+# Each read is (build, respond): build(view) runs in the sync hop with the
+# request setup and returns everything that may touch the database
+# outside the final fetch (label codes, cursor filters, the replica
+# check); respond(view, built) awaits the rows on the event loop.
+
+def _build_list(view):
+    return view._fast_page(view._filter_by_params(view.filter_queryset(view.get_queryset())))
+
+
+async def _list(view, page):
+    return await view._afast_paginated_response(page)
+
+
+def _build_pending(view):
+    queryset = view.get_queryset().filter(status='pending')
+    user_id = view.request.query_params.get('user_id')
+    if user_id:
+        queryset = queryset.filter(user_id=user_id)
+    return view._fast_page(queryset)
+
+
+async def _pending(view, page):
+    return await report_responses.aserve(
+        view.request, 'pending', lambda: view._afast_paginated_response(page),
+    )
+
+
+def _build_approved(view):
+    return view._fast_page(view.get_queryset().filter(status='approved'))
+
+
+async def _approved(view, page):
+    return await report_responses.aserve(
+        view.request, 'approved', lambda: view._afast_paginated_response(page),
+    )
+
+
+def _build_retrieve(view):
+    return view.filter_queryset(view.get_queryset()).filter(pk=view.kwargs['pk'])
+
+
+async def _retrieve(view, queryset):
+    report = await queryset.afirst()
+    if report is None:
+        raise Fallback()
+    return view.get_serializer(report).data
+
+
+def _build_export(view):
+    return view._export_stream()
+
+
+async def _export(view, stream):
+    return view._export_response(aiterate(stream))
+
+
+async def aiterate(iterator, batch=64):
+    """
+    Async iterator over a sync one (e.g. rows from QuerySet.iterator()),
+    pulled ``batch`` items per thread hop. Django's ASGI handler would
+    otherwise drain a sync streaming body into a list before sending it.
+    """
+    next_batch = sync_to_async(lambda: list(islice(iterator, batch)))
+    try:
+        while True:
+            items = await next_batch()
+            if not items:
+                return
+            for item in items:
+                yield item
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            # Closes the server-side cursor when the client goes away
+            await sync_to_async(close)()
+
+
+HANDLERS = {
+    'list': (_build_list, _list),
+    'retrieve': (_build_retrieve, _retrieve),
+    'pending_reports': (_build_pending, _pending),
+    'approve_reports': (_build_approved, _approved),
+    'export_reports': (_build_export, _export),
+}
+
+
+def _prepare(view, request, build):
+    """
+    The sync half of a read: content negotiation, authentication,
+    permissions, the replica choice and build(view), all run in one
+    worker thread.
+    """
+    drf_request = view.initialize_request(request)
+    view.request = drf_request
+    view.initial(drf_request)
+    if isinstance(drf_request.accepted_renderer, BrowsableAPIRenderer):
+        raise Fallback()
+    # Resolved here: choosing a replica may run its health check query
+    view.read_alias
+    return build(view)
+
+
+def _render(view, result):
+    if isinstance(result, HttpResponseBase) and not isinstance(result, Response):
+        # Already rendered (response cache hit, export stream)
+        return result
+    data = result.data if isinstance(result, Response) else result
+    renderer = view.request.accepted_renderer
+    content_type = renderer.media_type
+    if renderer.charset:
+        content_type = f'{content_type}; charset={renderer.charset}'
+    body = renderer.render(data, view.request.accepted_media_type, {'request': view.request, 'view': view})
+    response = HttpResponse(body, content_type=content_type)
+    response['Vary'] = 'Accept'
+    return response
+
+
+def async_report_view(action):
+    """
+    Async GET handler for one HazardReportViewSet read action.
+
+    Negotiation, authentication and permissions go through the viewset in a
+    single sync_to_async hop. The rows are fetched with the async ORM
+    (afirst / async iteration), so the event loop keeps serving other
+    requests while Postgres answers; the export is streamed a batch of
+    lines per thread hop instead of being buffered. Any other method, and any request the
+    viewset answers with an error, is handed to the sync viewset.
+    """
+    sync_view = sync_to_async(SYNC_VIEWS[action])
+    build, respond = HANDLERS[action]
+    # renderer_classes etc. given to @action, as the router passes them
+    initkwargs = getattr(getattr(HazardReportViewSet, action), 'kwargs', {})
+
+    async def view_func(request, **kwargs):
+        if request.method != 'GET':
+            return await sync_view(request, **kwargs)
+        view = HazardReportViewSet(
+            action_map={'get': action}, args=(), kwargs=kwargs, format_kwarg=None, headers={}, **initkwargs,
+        )
+        try:
+            built = await sync_to_async(_prepare)(view, request, build)
+            return _render(view, await respond(view, built))
+        except (APIException, Fallback):
+            return await sync_view(request, **kwargs)
+
+    view_func.csrf_exempt = True
+    return view_func
@@ -0,0 +1,38 @@
+from django.conf import settings
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+
+from map.db_router import replicas
+from map.utils.db_pool import pool_stats
+from map.utils.handle_response import handle_response
+
+
+# =============================
+# 🩺 DB POOL METRICS
+# =============================
+@swagger_auto_schema(
+    method='get',
+    operation_summary="Connection pool metrics of the worker serving this request",
+    responses={200: 'Pool counters per database alias (null when not pooled)'}
+)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def db_pool(request):
+    data = {alias: pool_stats(alias) for alias in settings.DATABASES}
+    return handle_response(data=data, status_code=status.HTTP_200_OK)
+
+
+# =============================
+# 🩺 READ REPLICAS
+# =============================
+@swagger_auto_schema(
+    method='get',
+    operation_summary="Lag and health of each read replica as seen by this worker",
+    responses={200: '{alias: {lag, healthy}}; lag is null when the replica is unreachable'}
+)
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def db_replicas(request):
+    return handle_response(data=replicas.status(), status_code=status.HTTP_200_OK)
@@ -0,0 +1,53 @@
+from django.conf import settings
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+
+from map.renderers.hazard_report import MVTRenderer
+from map.utils.geo import mercator_xy, tile_bounds
+from map.utils.mvt import TILE_EXTENT, encode_point_layer
+from map.utils.spatial_index import approved_reports
+from map.utils.tile_cache import TILE_BUFFER, hazard_tiles
+
+
+def render_hazard_tile(z, x, y):
+    """Encode the approved reports drawn on tile z/x/y (buffer included)."""
+    n = 2 ** z
+    buffer = TILE_BUFFER / TILE_EXTENT
+    features = []
+    for report_id, lat, lon, (report_type, severity) in approved_reports.within(*tile_bounds(z, x, y, buffer)):
+        mx, my = mercator_xy(lat, lon)
+        px = (mx * n - x) * TILE_EXTENT
+        py = (my * n - y) * TILE_EXTENT
+        if -TILE_BUFFER <= px <= TILE_EXTENT + TILE_BUFFER and -TILE_BUFFER <= py <= TILE_EXTENT + TILE_BUFFER:
+            features.append((px, py, {
+                'id': report_id,
+                'type': report_type,
+                'severity': severity,
+                'status': 'approved',
+            }))
+    return encode_point_layer('hazards', features)
+
+
+# =============================
+# 🗺️ VECTOR TILES
+# =============================
+@swagger_auto_schema(
+    method='get',
+    operation_summary="Approved hazard reports as a Mapbox Vector Tile",
+    responses={200: 'Protobuf tile, layer "hazards" (id, type, severity, status)', 404: 'Tile out of range'}
+)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@renderer_classes([MVTRenderer])
+def hazard_tile(request, z, x, y):
+    if not (0 <= z <= getattr(settings, 'HAZARD_TILE_MAX_ZOOM', 20) and 0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        return Response(status=status.HTTP_404_NOT_FOUND)
+
+    data = hazard_tiles.get(z, x, y)
+    if data is None:
+        data = render_hazard_tile(z, x, y)
+        hazard_tiles.set(z, x, y, data)
+    return Response(data, status=status.HTTP_200_OK)
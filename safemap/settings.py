@@ -10,9 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import copy
+from datetime import timedelta
 from pathlib import Path
 import os
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -45,6 +48,48 @@ DATABASES = {
     }
 }
 
+# Connection pool per worker process (psycopg_pool, via psycopg[pool]). With
+# CONN_HEALTH_CHECKS Django has the pool check each connection on checkout;
+# connections are recycled after DB_POOL_MAX_LIFETIME seconds. DB_POOL=0 falls
+# back to persistent per-thread connections (CONN_MAX_AGE).
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+if os.getenv('DB_POOL', '1') == '1':
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+        'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', '1800')),
+        'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+
+# Read replicas: DB_REPLICA_HOSTS=host1,host2 adds aliases replica_1, replica_2, ...
+# with the primary's credentials (DB_REPLICA_PORT to override the port). Report
+# list/detail/feed/export reads go to a replica at most HAZARD_REPLICA_MAX_LAG
+# seconds behind; clients that wrote in the last HAZARD_PRIMARY_PIN_SECONDS
+# keep reading the primary (map/db_router.py, map/middleware/replica.py).
+for index, host in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(',')), start=1):
+    replica = copy.deepcopy(DATABASES['default'])
+    replica['HOST'] = host.strip()
+    replica['PORT'] = os.getenv('DB_REPLICA_PORT', replica['PORT'])
+    replica['TEST'] = {'MIRROR': 'default'}
+    DATABASES[f'replica_{index}'] = replica
+DATABASE_ROUTERS = ['map.db_router.PrimaryReplicaRouter']
+HAZARD_REPLICA_MAX_LAG = float(os.getenv('HAZARD_REPLICA_MAX_LAG', '5'))
+HAZARD_REPLICA_CHECK_INTERVAL = int(os.getenv('HAZARD_REPLICA_CHECK_INTERVAL', '10'))
+HAZARD_PRIMARY_PIN_SECONDS = int(os.getenv('HAZARD_PRIMARY_PIN_SECONDS', '5'))
+
+# Local memory by default (per worker). Point CACHE_BACKEND/CACHE_LOCATION at a
+# shared cache (e.g. django.core.cache.backends.redis.RedisCache) to share
+# cached feeds and the report version counter between gunicorn workers.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'safemap'),
+    }
+}
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOWED_ORIGINS = [
     "*",
@@ -71,13 +116,17 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
+    'rest_framework_simplejwt.token_blacklist',
     'map',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'map.middleware.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'map.middleware.replica.PrimaryPinMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -153,3 +202,124 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# JWT: request.user is built from the token claims (map/authentication/jwt.py),
+# so the user_id claim carries User.user_id, the UUID used across the API
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'map.authentication.jwt.ClaimsJWTAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ],
+}
+
+SIMPLE_JWT = {
+    'USER_ID_FIELD': 'user_id',
+    'USER_ID_CLAIM': 'user_id',
+    'ACCESS_TOKEN_LIFETIME': timedelta(minutes=int(os.getenv('JWT_ACCESS_MINUTES', '5'))),
+    'REFRESH_TOKEN_LIFETIME': timedelta(days=int(os.getenv('JWT_REFRESH_DAYS', '1'))),
+}
+
+# Accounts changed after their tokens were issued (deactivated, new role)
+HAZARD_PRINCIPAL_CACHE_ALIAS = os.getenv('HAZARD_PRINCIPAL_CACHE_ALIAS', 'default')
+HAZARD_PRINCIPAL_CACHE_SIZE = int(os.getenv('HAZARD_PRINCIPAL_CACHE_SIZE', '10000'))
+HAZARD_PRINCIPAL_CACHE_TTL = int(os.getenv('HAZARD_PRINCIPAL_CACHE_TTL', '30'))
+# Per-worker filter of logged-out tokens (map/authentication/revocation.py):
+# sized for this many live revocations, and reloaded every REFRESH seconds
+# (re-reading the last OVERLAP seconds of the blacklist, plus a full reload
+# every FULL_RELOAD seconds, so rows that commit late are not missed)
+HAZARD_REVOCATION_CAPACITY = int(os.getenv('HAZARD_REVOCATION_CAPACITY', '100000'))
+HAZARD_REVOCATION_FP_RATE = float(os.getenv('HAZARD_REVOCATION_FP_RATE', '0.001'))
+HAZARD_REVOCATION_REFRESH = int(os.getenv('HAZARD_REVOCATION_REFRESH', '5'))
+HAZARD_REVOCATION_OVERLAP = int(os.getenv('HAZARD_REVOCATION_OVERLAP', '60'))
+HAZARD_REVOCATION_FULL_RELOAD = int(os.getenv('HAZARD_REVOCATION_FULL_RELOAD', '300'))
+
+# Password hashing: pbkdf2_sha256 at HAZARD_PBKDF2_ITERATIONS, never below
+# Django's default (weaker hashes are upgraded on login), run in a bounded
+# per-worker pool that answers 503 when full or past HAZARD_PASSWORD_TIMEOUT
+PASSWORD_HASHERS = [
+    'map.authentication.hashers.TunedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+HAZARD_PBKDF2_ITERATIONS = int(os.getenv('HAZARD_PBKDF2_ITERATIONS', '1000000'))
+HAZARD_PASSWORD_WORKERS = int(os.getenv('HAZARD_PASSWORD_WORKERS', '2'))
+# Under WSGI every hashing or queued login holds a gthread thread, so the pool
+# stays HAZARD_PASSWORD_SPARE_THREADS below GUNICORN_THREADS (same default as
+# gunicorn.conf.py) to keep reads served during a login storm; the queue
+# defaults to what is left, and a larger explicit pool refuses to start
+GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', '8'))
+HAZARD_PASSWORD_SPARE_THREADS = int(os.getenv('HAZARD_PASSWORD_SPARE_THREADS', '2'))
+HAZARD_PASSWORD_QUEUE = int(os.getenv(
+    'HAZARD_PASSWORD_QUEUE',
+    str(max(0, GUNICORN_THREADS - HAZARD_PASSWORD_SPARE_THREADS - HAZARD_PASSWORD_WORKERS)),
+))
+HAZARD_PASSWORD_TIMEOUT = int(os.getenv('HAZARD_PASSWORD_TIMEOUT', '10'))
+if (os.getenv('SERVER_MODE', 'wsgi') != 'asgi'
+        and HAZARD_PASSWORD_WORKERS + HAZARD_PASSWORD_QUEUE > GUNICORN_THREADS - HAZARD_PASSWORD_SPARE_THREADS):
+    raise ImproperlyConfigured(
+        f"HAZARD_PASSWORD_WORKERS + HAZARD_PASSWORD_QUEUE ({HAZARD_PASSWORD_WORKERS} + {HAZARD_PASSWORD_QUEUE}) "
+        f"must leave HAZARD_PASSWORD_SPARE_THREADS ({HAZARD_PASSWORD_SPARE_THREADS}) of "
+        f"GUNICORN_THREADS ({GUNICORN_THREADS}) free for other requests"
+    )
+
+# Serve the report reads from async views (set by gunicorn.conf.py in SERVER_MODE=asgi)
+HAZARD_ASYNC_READS = os.getenv('HAZARD_ASYNC_READS', '0') == '1'
+
+# Server-Sent Events for approved/deleted reports (/reports/events/?bbox=...),
+# served in SERVER_MODE=asgi only: under WSGI a stream would pin a thread.
+# The default broker only reaches streams in the same process; with several
+# workers set HAZARD_EVENT_BROKER=map.utils.hazard_events.PostgresBroker
+# (LISTEN/NOTIFY). Subscriptions are bucketed in HAZARD_EVENT_CELL_DEG cells.
+HAZARD_EVENT_BROKER = os.getenv('HAZARD_EVENT_BROKER', 'map.utils.hazard_events.InProcessBroker')
+HAZARD_EVENT_CELL_DEG = float(os.getenv('HAZARD_EVENT_CELL_DEG', '0.5'))
+HAZARD_EVENT_MAX_CELLS = int(os.getenv('HAZARD_EVENT_MAX_CELLS', '1024'))
+HAZARD_EVENT_MAX_SUBSCRIBERS = int(os.getenv('HAZARD_EVENT_MAX_SUBSCRIBERS', '5000'))
+HAZARD_EVENT_QUEUE = int(os.getenv('HAZARD_EVENT_QUEUE', '256'))
+HAZARD_EVENT_HEARTBEAT = int(os.getenv('HAZARD_EVENT_HEARTBEAT', '15'))
+
+# Seconds a status/type/severity label that does not exist (e.g. ?status=typo)
+# is remembered as missing before hazard_report_code is asked again
+HAZARD_CODE_MISS_TTL = int(os.getenv('HAZARD_CODE_MISS_TTL', '5'))
+
+# Keyset pagination for report lists (map/utils/pagination.py)
+HAZARD_REPORT_PAGE_SIZE = int(os.getenv('HAZARD_REPORT_PAGE_SIZE', '50'))
+HAZARD_REPORT_MAX_PAGE_SIZE = int(os.getenv('HAZARD_REPORT_MAX_PAGE_SIZE', '500'))
+
+# Rows fetched per round trip by /reports/export/ (server-side cursor)
+HAZARD_EXPORT_CHUNK_SIZE = int(os.getenv('HAZARD_EXPORT_CHUNK_SIZE', '2000'))
+
+# Versioned cache for /reports/pending/ and /reports/approve/ (map/utils/response_cache.py)
+HAZARD_RESPONSE_CACHE_ALIAS = os.getenv('HAZARD_RESPONSE_CACHE_ALIAS', 'default')
+HAZARD_RESPONSE_CACHE_TTL = int(os.getenv('HAZARD_RESPONSE_CACHE_TTL', '300'))
+# Cached per-user counts by status for /users/{user_id}/reports (map/utils/report_counts.py)
+HAZARD_USER_COUNTS_TTL = int(os.getenv('HAZARD_USER_COUNTS_TTL', '300'))
+
+# Response compression (map/middleware/compression.py): smallest body worth
+# compressing, and raw bytes between flushes when compressing streamed exports
+HAZARD_COMPRESS_MIN_SIZE = int(os.getenv('HAZARD_COMPRESS_MIN_SIZE', '1024'))
+HAZARD_COMPRESS_FLUSH_SIZE = int(os.getenv('HAZARD_COMPRESS_FLUSH_SIZE', '32768'))
+
+# POST /reports/bulk/ limits
+HAZARD_BULK_MAX_ITEMS = int(os.getenv('HAZARD_BULK_MAX_ITEMS', '5000'))
+HAZARD_BULK_BATCH_SIZE = int(os.getenv('HAZARD_BULK_BATCH_SIZE', '1000'))
+
+# Delta sync (/reports/changes/): rows per call, and how far behind "now" the
+# watermark stays so in-flight transactions are not skipped
+HAZARD_SYNC_PAGE_SIZE = int(os.getenv('HAZARD_SYNC_PAGE_SIZE', '1000'))
+HAZARD_SYNC_SAFETY_LAG = int(os.getenv('HAZARD_SYNC_SAFETY_LAG', '2'))
+# Tombstones older than this are deleted by `manage.py prune_tombstones` (run
+# it daily); sync tokens older than this get 410 and must do a full sync
+HAZARD_SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv('HAZARD_SYNC_TOMBSTONE_RETENTION_DAYS', '30'))
+
+# In-process spatial index of approved hazard reports (map/utils/spatial_index.py)
+HAZARD_INDEX_CELL_DEG = float(os.getenv('HAZARD_INDEX_CELL_DEG', '0.01'))
+HAZARD_INDEX_MAX_AGE = int(os.getenv('HAZARD_INDEX_MAX_AGE', '300'))
+# Deepest zoom kept in the precomputed cluster pyramid (map/utils/clustering.py)
+HAZARD_CLUSTER_MAX_ZOOM = int(os.getenv('HAZARD_CLUSTER_MAX_ZOOM', '12'))
+
+# Vector tile cache (map/utils/tile_cache.py). Set HAZARD_TILE_CACHE_DIR to also keep tiles on disk.
+HAZARD_TILE_MAX_ZOOM = int(os.getenv('HAZARD_TILE_MAX_ZOOM', '20'))
+HAZARD_TILE_CACHE_SIZE = int(os.getenv('HAZARD_TILE_CACHE_SIZE', '2048'))
+HAZARD_TILE_CACHE_DIR = os.getenv('HAZARD_TILE_CACHE_DIR') or None